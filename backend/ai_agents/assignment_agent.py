@@ -1,23 +1,38 @@
 # assignment_logic.py
 
 from sqlalchemy.orm import Session
-from models import EmployeeProfile
+from models import EmployeeProfile, Task
+from query_options import profile_with_user
+from ai_agents.skill_index import skill_index
+from ai_agents.skill_matrix import skill_matrix
+from ai_agents.assignment_solver import assign_tasks, AssignmentTooLarge
 import logging
+import os
 
 # Set up logging to help debug issues
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def match_employees_by_skills(db: Session, required_skills: list):
+# "index" (inverted skill index) or "numpy" (vectorized skill matrix)
+SKILL_MATCH_ENGINE = os.getenv("SKILL_MATCH_ENGINE", "index")
+# "optimal" (maximum-weight assignment solver, SciPy's linear_sum_assignment) or "greedy" for batch assignment
+BATCH_ASSIGN_STRATEGY = os.getenv("BATCH_ASSIGN_STRATEGY", "optimal")
+# Tasks one available employee may receive from a single batch
+BATCH_ASSIGN_TASKS_PER_EMPLOYEE = int(os.getenv("BATCH_ASSIGN_TASKS_PER_EMPLOYEE", 1))
+
+def match_employees_by_skills(db: Session, required_skills: list, engine: str = None):
     """
     Match employees based on their skills against required skills.
     Returns the best matching employee profile or None if no match found.
+
+    `engine` selects the scoring backend: "index" (inverted skill index, default)
+    or "numpy" (vectorized bitset matrix, faster for large employee pools).
+    Defaults to the SKILL_MATCH_ENGINE environment variable.
     """
     if not required_skills:
         logger.warning("No required skills provided")
         return None
     
-    matched = []
     required_skills_lower = [s.strip().lower() for s in required_skills if s.strip()]
     
     if not required_skills_lower:
@@ -25,66 +40,58 @@ def match_employees_by_skills(db: Session, required_skills: list):
         return None
 
     try:
-        # Query available employees
-        profiles = db.query(EmployeeProfile).filter(
-            EmployeeProfile.is_available.is_(True)
-        ).all()
-        
-        logger.info(f"Found {len(profiles)} available employees")
-        
-        if not profiles:
-            logger.warning("No available employees found")
-            return None
+        ranked = rank_candidates(db, required_skills_lower, engine)
 
-        for profile in profiles:
-            # Skip if no skills defined
-            if not profile.skills:
-                logger.debug(f"Employee {profile.user.id if profile.user else 'Unknown'} has no skills defined")
-                continue
+        logger.info(f"Found {len(ranked)} available employees sharing a required skill")
 
-            # Normalize and parse skills
-            user_skills = normalize_skills(profile.skills)
-            
-            if not user_skills:
-                logger.debug(f"Employee {profile.user.id if profile.user else 'Unknown'} has no valid skills")
+        if not ranked:
+            logger.warning("No employees found with matching skills")
+            return None
+
+        # Load only the winning profile; skip entries that went stale since indexing
+        for profile_id, match_score, match_percentage in ranked:
+            profile = db.get(EmployeeProfile, profile_id, options=[profile_with_user()])
+            if profile is None or not profile.is_available:
+                unindex_employee_profile(profile_id)
                 continue
 
-            # Calculate match score
-            matching_skills = set(required_skills_lower) & set(user_skills)
-            match_score = len(matching_skills)
-            match_percentage = (match_score / len(required_skills_lower)) * 100
-
-            logger.debug(f"Employee {profile.user.id if profile.user else 'Unknown'}: "
-                        f"Skills: {user_skills}, Match score: {match_score}, "
-                        f"Match percentage: {match_percentage:.1f}%")
-
-            if match_score > 0:
-                matched.append({
-                    'profile': profile,
-                    'match_score': match_score,
-                    'match_percentage': match_percentage,
-                    'matching_skills': list(matching_skills)
-                })
+            logger.info(f"Best match: Employee {profile.user_id} "
+                       f"with {match_score} matching skills "
+                       f"({match_percentage:.1f}% match)")
 
-        if not matched:
-            logger.warning("No employees found with matching skills")
-            return None
+            return profile
 
-        # Sort by match score (descending), then by match percentage
-        matched.sort(key=lambda x: (x['match_score'], x['match_percentage']), reverse=True)
-        
-        best_match = matched[0]
-        logger.info(f"Best match: Employee {best_match['profile'].user.id if best_match['profile'].user else 'Unknown'} "
-                   f"with {best_match['match_score']} matching skills "
-                   f"({best_match['match_percentage']:.1f}% match)")
-        
-        return best_match['profile']
+        logger.warning("No available employees found with matching skills")
+        return None
 
     except Exception as e:
         logger.error(f"Error in match_employees_by_skills: {str(e)}")
         return None
 
 
+def rank_candidates(db: Session, required_skills_lower: list, engine: str = None):
+    """
+    Rank available profiles sharing at least one of the normalized required skills.
+    Returns `(profile_id, match_score, match_percentage)` tuples, best first.
+    """
+    engine = engine or SKILL_MATCH_ENGINE
+
+    if engine == "numpy":
+        skill_matrix.ensure_built(db)
+        return skill_matrix.rank(required_skills_lower)
+
+    skill_index.ensure_built(db)
+    ranked = []
+    for profile_id, matching_skills in skill_index.candidates(required_skills_lower).items():
+        match_score = len(matching_skills)
+        match_percentage = (match_score / len(required_skills_lower)) * 100
+        ranked.append((profile_id, match_score, match_percentage))
+
+    # Sort by match score (descending), then by match percentage, then by profile id
+    ranked.sort(key=lambda x: (-x[1], -x[2], x[0]))
+    return ranked
+
+
 def normalize_skills(skills):
     """
     Normalize skills from various formats (string, list, etc.) to a clean list.
@@ -112,9 +119,32 @@ def normalize_skills(skills):
     return user_skills
 
 
-def auto_assign_agent(db: Session, skills: list, task_id: str = None):
+def index_employee_profile(profile: EmployeeProfile):
+    """
+    Reflect an employee profile's current availability and skills in the skill index
+    and skill matrix.
+    """
+    if not profile.is_available:
+        unindex_employee_profile(profile.id)
+        return
+
+    skills = normalize_skills(profile.skills) if profile.skills else []
+    skill_index.add(profile.id, profile.user_id, skills)
+    skill_matrix.add(profile.id, profile.user_id, skills)
+
+
+def unindex_employee_profile(profile_id: int):
+    """
+    Remove a profile that is no longer available from the skill index and skill matrix.
+    """
+    skill_index.remove(profile_id)
+    skill_matrix.remove(profile_id)
+
+
+def auto_assign_agent(db: Session, skills: list, task_id: str = None, engine: str = None):
     """
     Auto-assign a task to the best matching available employee.
+    `engine` is passed through to `match_employees_by_skills`.
     """
     logger.info(f"Starting auto-assignment for skills: {skills}")
     
@@ -127,7 +157,7 @@ def auto_assign_agent(db: Session, skills: list, task_id: str = None):
         }
 
     try:
-        best_match = match_employees_by_skills(db, skills)
+        best_match = match_employees_by_skills(db, skills, engine)
 
         if best_match:
             # Verify the employee profile has a valid user relationship
@@ -144,6 +174,7 @@ def auto_assign_agent(db: Session, skills: list, task_id: str = None):
             
             try:
                 db.commit()
+                unindex_employee_profile(best_match.id)
                 logger.info(f"Successfully assigned task {task_id or 'Unknown'} to user {best_match.user.id}")
                 
                 return {
@@ -179,12 +210,150 @@ def auto_assign_agent(db: Session, skills: list, task_id: str = None):
         }
 
 
+def plan_batch_assignment(db: Session, skills_per_task: list, engine: str = None, exclude: set = None,
+                          strategy: str = None, capacities=None):
+    """
+    Compute a consistent assignment for several tasks at once.
+
+    `capacities` is an int or a {profile_id: capacity} mapping giving how many
+    of the batch's tasks each available employee may receive (default
+    BATCH_ASSIGN_TASKS_PER_EMPLOYEE). "optimal" (default) maximizes the total
+    match score of the batch with `assignment_solver`, falling back to greedy
+    when the batch is too large for the solver; "greedy" places the tasks with
+    the fewest candidates first, taking each one's best employee with capacity
+    left. Returns one `(profile_id, match_score, match_percentage)` tuple per
+    task, or None where no employee is left.
+    """
+    strategy = strategy or BATCH_ASSIGN_STRATEGY
+    capacities = BATCH_ASSIGN_TASKS_PER_EMPLOYEE if capacities is None else capacities
+    exclude = set(exclude or ())
+    skills_lower = [[s.strip().lower() for s in (skills or []) if s.strip()] for skills in skills_per_task]
+
+    if strategy == "optimal":
+        skill_matrix.ensure_built(db)
+        try:
+            return assign_tasks(skill_matrix, skills_lower, capacities=capacities, exclude=exclude)
+        except AssignmentTooLarge as e:
+            logger.warning(f"Batch too large for the assignment solver ({str(e)}), using greedy")
+
+    rankings = []
+    for required_skills_lower in skills_lower:
+        ranked = rank_candidates(db, required_skills_lower, engine) if required_skills_lower else []
+        rankings.append([r for r in ranked if r[0] not in exclude])
+
+    def capacity_of(profile_id):
+        return capacities.get(profile_id, 1) if isinstance(capacities, dict) else capacities
+
+    plan = [None] * len(skills_per_task)
+    taken = {}
+    for i in sorted(range(len(rankings)), key=lambda i: (len(rankings[i]), i)):
+        for candidate in rankings[i]:
+            if taken.get(candidate[0], 0) < capacity_of(candidate[0]):
+                taken[candidate[0]] = taken.get(candidate[0], 0) + 1
+                plan[i] = candidate
+                break
+
+    return plan
+
+
+def auto_assign_batch(db: Session, tasks: list, engine: str = None, strategy: str = None, capacities=None):
+    """
+    Auto-assign a list of `TaskCreate` objects in one transaction. `capacities`
+    is passed through to `plan_batch_assignment`.
+
+    Computes the assignment for the whole batch, inserts every assigned task and
+    marks every chosen employee unavailable with a single commit. Returns one
+    result dict per input task, in input order.
+    """
+    logger.info(f"Starting batch auto-assignment for {len(tasks)} tasks")
+
+    skills_per_task = [task.required_skills for task in tasks]
+    stale = set()
+    try:
+        # Re-plan if a chosen profile turned out to be stale (e.g. changed by another process)
+        for _ in range(3):
+            plan = plan_batch_assignment(db, skills_per_task, engine, exclude=stale, strategy=strategy,
+                                         capacities=capacities)
+            chosen = {p[0] for p in plan if p}
+            profiles = {
+                profile.id: profile
+                for profile in db.query(EmployeeProfile).filter(
+                    EmployeeProfile.id.in_(chosen),
+                    EmployeeProfile.is_available.is_(True)
+                ).all()
+            } if chosen else {}
+            newly_stale = chosen - profiles.keys()
+            if not newly_stale:
+                break
+            for profile_id in newly_stale:
+                unindex_employee_profile(profile_id)
+            stale |= newly_stale
+        else:
+            plan = [p if p and p[0] in profiles else None for p in plan]
+
+        new_tasks = []
+        results = []
+        for i, (task, planned) in enumerate(zip(tasks, plan)):
+            if not planned:
+                results.append({
+                    "index": i,
+                    "success": False,
+                    "task_id": None,
+                    "assigned_to": None,
+                    "skills_extracted": task.required_skills,
+                    "message": "No available employees found with matching skills"
+                })
+                continue
+
+            profile_id, match_score, match_percentage = planned
+            profile = profiles[profile_id]
+            profile.is_available = False
+            new_task = Task(
+                title=task.title,
+                description=task.description,
+                status=task.status,
+                required_skills=task.required_skills,
+                due_date=task.due_date,
+                assignee_id=profile.user_id
+            )
+            new_tasks.append((i, new_task))
+            results.append({
+                "index": i,
+                "success": True,
+                "task_id": None,
+                "assigned_to": profile.user_id,
+                "employee_profile_id": profile_id,
+                "skills_extracted": task.required_skills,
+                "match_score": match_score,
+                "match_percentage": match_percentage,
+                "message": f"Task assigned to user {profile.user_id}"
+            })
+
+        db.add_all([new_task for _, new_task in new_tasks])
+        db.flush()
+        for i, new_task in new_tasks:
+            results[i]["task_id"] = new_task.id
+        db.commit()
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error in auto_assign_batch: {str(e)}")
+        raise
+
+    for result in results:
+        if result["success"]:
+            unindex_employee_profile(result["employee_profile_id"])
+
+    logger.info(f"Batch auto-assignment placed {len(new_tasks)} of {len(tasks)} tasks")
+    return results
+
+
 def get_available_employees_with_skills(db: Session):
     """
     Helper function to get all available employees and their skills for debugging.
     """
     try:
-        profiles = db.query(EmployeeProfile).filter(
+        profiles = db.query(EmployeeProfile).options(profile_with_user()).filter(
             EmployeeProfile.is_available.is_(True)
         ).all()
         
@@ -216,6 +385,7 @@ def release_employee(db: Session, user_id: int):
         if profile:
             profile.is_available = True
             db.commit()
+            index_employee_profile(profile)
             logger.info(f"Released employee {user_id} back to available status")
             return True
         else:
@@ -0,0 +1,188 @@
+# assignment_solver.py
+
+import os
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    # SciPy's C implementation (in requirements.txt); the NumPy Hungarian below is only a fallback
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    linear_sum_assignment = None
+
+# Tasks scored per chunk when building the task x employee matrix, bounds memory
+SCORE_CHUNK_ROWS = 256
+# Largest tasks x employee-slots problem the solver accepts: the dense cost matrix is 8 bytes per cell,
+# and without SciPy the O(n^2 m) fallback only stays interactive up to about 200 x 200
+ASSIGNMENT_SOLVER_MAX_CELLS = int(os.getenv(
+    "ASSIGNMENT_SOLVER_MAX_CELLS", 4_000_000 if linear_sum_assignment is not None else 40_000
+))
+
+
+class AssignmentTooLarge(ValueError):
+    pass
+
+
+def build_score_matrix(task_bits: np.ndarray, employee_bits: np.ndarray):
+    """
+    Build the task x employee match-score matrix from packed skill bitsets.
+
+    `task_bits` is (tasks, words) and `employee_bits` is (employees, words), both
+    encoded over the same vocabulary (see `SkillMatrix.encode`). Entry [t, e] is
+    the number of required skills of task t that employee e has.
+    """
+    scores = np.zeros((task_bits.shape[0], employee_bits.shape[0]), dtype=np.int64)
+    for start in range(0, task_bits.shape[0], SCORE_CHUNK_ROWS):
+        chunk = task_bits[start:start + SCORE_CHUNK_ROWS]
+        scores[start:start + len(chunk)] = np.bitwise_count(
+            chunk[:, None, :] & employee_bits[None, :, :]
+        ).sum(axis=2, dtype=np.int64)
+    return scores
+
+
+def solve_max_weight_assignment(scores: np.ndarray, capacities=None):
+    """
+    Maximum-weight assignment of tasks (rows) to employees (columns).
+
+    `capacities` is an int or per-column array limiting how many tasks each
+    employee may receive (default 1). Returns `(task_index, employee_index)`
+    pairs; pairs with a score of 0 are dropped, so a task is only assigned to
+    someone sharing at least one skill.
+    """
+    tasks, employees = scores.shape
+    if tasks == 0 or employees == 0:
+        return []
+
+    if capacities is None:
+        capacities = 1
+    capacities = np.broadcast_to(np.asarray(capacities, dtype=np.int64), (employees,))
+    # No employee can usefully take more tasks than there are
+    slots_per_employee = np.minimum(capacities, tasks)
+    slot_owner = np.repeat(np.arange(employees), slots_per_employee)
+    if slot_owner.size == 0:
+        return []
+
+    cost = -scores[:, slot_owner].astype(np.float64)
+    rows, cols = _linear_sum_assignment(cost)
+
+    return [
+        (int(t), int(slot_owner[c]))
+        for t, c in zip(rows, cols)
+        if scores[t, slot_owner[c]] > 0
+    ]
+
+
+def assign_tasks(matrix, skills_per_task: list, capacities=None, exclude: set = None,
+                 max_cells: int = ASSIGNMENT_SOLVER_MAX_CELLS):
+    """
+    Optimally assign tasks to the employees held in a `SkillMatrix`.
+
+    `skills_per_task` holds each task's normalized required skills. `capacities`
+    is an int or a {profile_id: capacity} mapping (default 1 task per employee);
+    profile ids in `exclude` are skipped. Returns one `(profile_id, match_score,
+    match_percentage)` tuple per task, or None where the task stays unassigned.
+
+    Raises AssignmentTooLarge, before any score matrix is built, when tasks x
+    candidate employee slots exceeds `max_cells` (None for no limit).
+    """
+    plan = [None] * len(skills_per_task)
+    if not skills_per_task:
+        return plan
+
+    profile_ids, employee_bits = matrix.snapshot()
+    if exclude:
+        keep = ~np.isin(profile_ids, list(exclude))
+        profile_ids, employee_bits = profile_ids[keep], employee_bits[keep]
+
+    # The vocabulary only grows, so skills added after the snapshot cannot match it
+    task_bits = np.stack([matrix.encode(skills) for skills in skills_per_task])[:, :employee_bits.shape[1]]
+
+    # Only employees sharing a skill with at least one task take part in the solve
+    wanted = np.bitwise_or.reduce(task_bits, axis=0)
+    relevant = np.flatnonzero((employee_bits & wanted).any(axis=1))
+    employee_bits, profile_ids = employee_bits[relevant], profile_ids[relevant]
+
+    if isinstance(capacities, dict):
+        capacities = np.array([capacities.get(int(pid), 1) for pid in profile_ids], dtype=np.int64)
+
+    slots = int(np.minimum(np.broadcast_to(1 if capacities is None else capacities, (len(profile_ids),)),
+                           len(skills_per_task)).sum())
+    if max_cells is not None and len(skills_per_task) * slots > max_cells:
+        raise AssignmentTooLarge(f"{len(skills_per_task)} tasks x {slots} employee slots exceeds {max_cells} cells")
+
+    scores = build_score_matrix(task_bits, employee_bits)
+
+    for t, e in solve_max_weight_assignment(scores, capacities):
+        match_score = int(scores[t, e])
+        match_percentage = (match_score / len(skills_per_task[t])) * 100
+        plan[t] = (int(profile_ids[e]), match_score, match_percentage)
+
+    logger.info(f"Assignment solver placed {sum(1 for p in plan if p)} of {len(plan)} tasks "
+                f"over {len(profile_ids)} candidate employees")
+    return plan
+
+
+def _linear_sum_assignment(cost: np.ndarray):
+    """
+    Minimum-cost assignment; every row is assigned when rows <= columns.
+    Returns `(row_indices, col_indices)`.
+    """
+    if linear_sum_assignment is not None:
+        return linear_sum_assignment(cost)
+
+    if cost.shape[0] > cost.shape[1]:
+        cols, rows = _hungarian(cost.T)
+        return rows, cols
+    return _hungarian(cost)
+
+
+def _hungarian(cost: np.ndarray):
+    """
+    Hungarian algorithm (shortest augmenting path with potentials, O(n^2 m))
+    for an n x m cost matrix with n <= m. The inner column scan is vectorized.
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)     # p[j]: row (1-based) matched to column j, 0 if free
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+
+            improve = free & (reduced < minv[1:])
+            minv[1:][improve] = reduced[improve]
+            way[1:][improve] = j0
+
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[~used] -= delta
+
+            j0 = j1
+            if p[j0] == 0:
+                break
+
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    cols = np.flatnonzero(p[1:])
+    rows = p[1:][cols] - 1
+    order = np.argsort(rows)
+    return rows[order], cols[order]
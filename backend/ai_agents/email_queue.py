@@ -0,0 +1,228 @@
+# email_queue.py
+
+import os
+import queue
+import random
+import smtplib
+import threading
+import time
+import logging
+from ai_agents.notification_agent import build_email, smtp_pool
+
+logger = logging.getLogger(__name__)
+
+EMAIL_WORKERS = int(os.getenv("EMAIL_WORKERS", 2))
+EMAIL_QUEUE_SIZE = int(os.getenv("EMAIL_QUEUE_SIZE", 10000))
+EMAIL_MAX_RETRIES = int(os.getenv("EMAIL_MAX_RETRIES", 5))
+EMAIL_RETRY_BACKOFF_SECONDS = float(os.getenv("EMAIL_RETRY_BACKOFF_SECONDS", 2))
+EMAIL_RETRY_BACKOFF_MAX_SECONDS = float(os.getenv("EMAIL_RETRY_BACKOFF_MAX_SECONDS", 300))
+
+
+def is_transient(error: Exception) -> bool:
+    """
+    Whether a failed send is worth retrying: a 4xx reply (mailbox busy,
+    greylisting, server overloaded) or a network error. A 5xx reply is a
+    permanent rejection and sending the same message again cannot succeed.
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError))
+
+
+class EmailQueue:
+    """
+    Background email delivery: request handlers only enqueue a message, a small
+    pool of worker threads sends it. Transient failures (4xx replies, network
+    errors) are retried with exponential backoff (plus jitter) up to
+    `max_retries` times; permanent 5xx rejections fail at once.
+    """
+
+    def __init__(self, deliver=None, workers: int = EMAIL_WORKERS, maxsize: int = EMAIL_QUEUE_SIZE,
+                 max_retries: int = EMAIL_MAX_RETRIES, backoff: float = EMAIL_RETRY_BACKOFF_SECONDS,
+                 backoff_max: float = EMAIL_RETRY_BACKOFF_MAX_SECONDS):
+        # Pooled SMTP connections by default
+        self._deliver = deliver or smtp_pool.send
+        self._workers = workers
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._backoff_max = backoff_max
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._threads = []
+        self._retry_timers = set()
+        self._lock = threading.Lock()
+        self._running = False
+        self._stats = {
+            "enqueued": 0,
+            "sent": 0,
+            "failed": 0,
+            "retried": 0,
+            "dropped": 0,
+            "in_flight": 0,
+            "pending_retries": 0,
+            "send_seconds_total": 0.0,
+            "send_seconds_max": 0.0,
+            "send_seconds_last": 0.0,
+        }
+
+    @property
+    def running(self):
+        return self._running
+
+    def start(self):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._threads = [
+                threading.Thread(target=self._worker, name=f"email-worker-{i}", daemon=True)
+                for i in range(self._workers)
+            ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Email queue started with {self._workers} workers")
+
+    def stop(self, timeout: float = 10):
+        """
+        Stop the workers after the queue drains (or `timeout` passes).
+        Pending retries are cancelled.
+        """
+        if not self._running:
+            return
+
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        with self._lock:
+            self._running = False
+            for timer in self._retry_timers:
+                timer.cancel()
+            self._retry_timers.clear()
+            self._stats["pending_retries"] = 0
+        for thread in self._threads:
+            thread.join(max(0, deadline - time.monotonic()))
+        self._threads = []
+        logger.info("Email queue stopped")
+
+    def enqueue(self, recipient: str, subject: str, message: str) -> bool:
+        """
+        Queue an email for delivery. Returns False when the queue is full.
+        """
+        if not self._running:
+            self.start()
+        job = {"recipient": recipient, "subject": subject, "message": message,
+               "attempts": 0, "enqueued_at": time.monotonic()}
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            self._count("dropped")
+            logger.error(f"Email queue full, dropping email to {recipient}")
+            return False
+        self._count("enqueued")
+        return True
+
+    def join(self, timeout: float = None) -> bool:
+        """
+        Wait until every queued message (including scheduled retries) is done.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks or self._stats["pending_retries"]:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        attempts = stats["sent"] + stats["failed"] + stats["retried"]
+        stats["queue_depth"] = self._queue.qsize()
+        stats["send_seconds_avg"] = stats["send_seconds_total"] / attempts if attempts else 0.0
+        stats["workers"] = len(self._threads)
+        return stats
+
+    def _worker(self):
+        while self._running:
+            try:
+                job = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                self._send(job)
+            finally:
+                self._queue.task_done()
+
+    def _send(self, job):
+        self._count("in_flight")
+        started = time.monotonic()
+        try:
+            self._deliver(build_email(job["recipient"], job["subject"], job["message"]))
+            ok, error = True, None
+        except Exception as e:
+            ok, error = False, e
+        elapsed = time.monotonic() - started
+
+        with self._lock:
+            self._stats["in_flight"] -= 1
+            self._stats["send_seconds_total"] += elapsed
+            self._stats["send_seconds_last"] = elapsed
+            self._stats["send_seconds_max"] = max(self._stats["send_seconds_max"], elapsed)
+
+        if ok:
+            self._count("sent")
+            logger.info(f"Email sent to {job['recipient']} in {elapsed * 1000:.0f} ms")
+            return
+
+        job["attempts"] += 1
+        if not is_transient(error):
+            self._count("failed")
+            logger.error(f"Email to {job['recipient']} rejected, not retrying: {error}")
+            return
+        if job["attempts"] > self._max_retries:
+            self._count("failed")
+            logger.error(f"Email to {job['recipient']} failed after {job['attempts']} attempts: {error}")
+            return
+
+        delay = min(self._backoff * 2 ** (job["attempts"] - 1), self._backoff_max)
+        delay *= random.uniform(0.5, 1.5)
+        self._count("retried")
+        logger.warning(f"Email to {job['recipient']} failed ({error}), retry {job['attempts']} in {delay:.1f}s")
+        self._schedule_retry(job, delay)
+
+    def _schedule_retry(self, job, delay):
+        def requeue():
+            with self._lock:
+                if timer not in self._retry_timers:
+                    return  # cancelled by stop()
+                self._retry_timers.discard(timer)
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self._count("dropped")
+                logger.error(f"Email queue full, dropping retry to {job['recipient']}")
+            with self._lock:
+                # Decremented only once the job is back on the queue, so join() never sees a gap
+                self._stats["pending_retries"] = max(0, self._stats["pending_retries"] - 1)
+
+        timer = threading.Timer(delay, requeue)
+        timer.daemon = True
+        with self._lock:
+            if not self._running:
+                return
+            self._retry_timers.add(timer)
+            self._stats["pending_retries"] += 1
+        timer.start()
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+
+# Shared, process-wide queue
+email_queue = EmailQueue()
+
+
+def enqueue_email(recipient: str, subject: str, message: str) -> bool:
+    return email_queue.enqueue(recipient, subject, message)
@@ -1,27 +1,160 @@
+# llm_client.py
+
 import os
-import requests
-
-ALLTOGETHER_API_KEY = os.getenv("ALLTOGETHER_API_KEY")
-LLM_ENDPOINT = "https://api.together.xyz/v1/chat/completions"
-
-def get_summary_from_llm(prompt: str) -> str:
-    headers = {
-        "Authorization": f"Bearer {ALLTOGETHER_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "model": "Qwen/Qwen3-235B-A22B-Thinking-2507",
-        "messages": [
-            {"role": "user", "content": f"Summarize the following task updates:\n{prompt}"}
-        ],
-        "temperature": 0.7,
-        "max_tokens": 300
-    }
+import random
+import asyncio
+import logging
+import time
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Any OpenAI-compatible chat completions API (Together by default)
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://api.together.xyz/v1")
+LLM_API_KEY = os.getenv("TOGETHER_API_KEY") or os.getenv("ALLTOGETHER_API_KEY")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", 60))
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", 5))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 3))
+LLM_RETRY_BACKOFF_SECONDS = float(os.getenv("LLM_RETRY_BACKOFF_SECONDS", 1))
+LLM_RETRY_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_RETRY_BACKOFF_MAX_SECONDS", 20))
+
+# Rate limited or provider-side failure: worth another attempt
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+SUMMARY_MODEL = "Qwen/Qwen3-235B-A22B-Thinking-2507"
+
+
+class LLMError(Exception):
+    pass
+
+
+class LLMClient:
+    """
+    Shared async client for chat completions: one pooled httpx connection
+    pool, connect/read timeouts on every call, at most `max_concurrency`
+    requests in flight, and jittered exponential backoff on 429/5xx and
+    transport errors (honouring Retry-After when the provider sends it).
+    """
+
+    def __init__(self, base_url: str = LLM_BASE_URL, api_key: str = LLM_API_KEY,
+                 max_concurrency: int = LLM_MAX_CONCURRENCY, timeout: float = LLM_TIMEOUT_SECONDS,
+                 connect_timeout: float = LLM_CONNECT_TIMEOUT_SECONDS, max_retries: int = LLM_MAX_RETRIES,
+                 backoff: float = LLM_RETRY_BACKOFF_SECONDS, backoff_max: float = LLM_RETRY_BACKOFF_MAX_SECONDS):
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self._api_key = api_key
+        self._timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._backoff_max = backoff_max
+        self._client = None
+        self._semaphore = None
+        self._in_flight = 0
+        self._stats = {
+            "requests": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "retried": 0,
+            "latency_seconds_total": 0.0,
+            "latency_seconds_max": 0.0,
+        }
+
+    def _get_client(self):
+        # Created on first use so both live on the running event loop
+        if self._client is None:
+            headers = {"Content-Type": "application/json"}
+            if self._api_key:
+                headers["Authorization"] = f"Bearer {self._api_key}"
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=self._timeout,
+                limits=httpx.Limits(max_connections=self.max_concurrency,
+                                    max_keepalive_connections=self.max_concurrency),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def chat(self, messages: list, model: str, max_tokens: int = 512, temperature: float = 0.7) -> str:
+        """
+        Run one chat completion and return the message content.
+        Raises LLMError once retries are exhausted or on a non-retryable error.
+        """
+        client = self._get_client()
+        payload = {"model": model, "messages": messages, "max_tokens": max_tokens, "temperature": temperature}
+
+        for attempt in range(self._max_retries + 1):
+            retry_after = None
+            async with self._semaphore:
+                self._in_flight += 1
+                self._stats["requests"] += 1
+                started = time.monotonic()
+                try:
+                    response = await client.post("/chat/completions", json=payload)
+                    error = None
+                except httpx.TransportError as e:
+                    response, error = None, e
+                finally:
+                    self._in_flight -= 1
+                    elapsed = time.monotonic() - started
+                    self._stats["latency_seconds_total"] += elapsed
+                    self._stats["latency_seconds_max"] = max(self._stats["latency_seconds_max"], elapsed)
+
+            if response is not None:
+                if response.status_code < 400:
+                    self._stats["succeeded"] += 1
+                    try:
+                        return response.json()["choices"][0]["message"]["content"]
+                    except (ValueError, KeyError, IndexError) as e:
+                        self._stats["failed"] += 1
+                        raise LLMError(f"Unexpected LLM response: {e}")
+                if response.status_code not in RETRY_STATUSES:
+                    self._stats["failed"] += 1
+                    raise LLMError(f"LLM request failed with HTTP {response.status_code}: {response.text[:200]}")
+                error = f"HTTP {response.status_code}"
+                retry_after = response.headers.get("Retry-After")
+
+            if attempt == self._max_retries:
+                break
+            delay = self._retry_delay(attempt, retry_after)
+            self._stats["retried"] += 1
+            logger.warning(f"LLM request failed ({error}), retry {attempt + 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+        self._stats["failed"] += 1
+        raise LLMError(f"LLM request failed after {self._max_retries + 1} attempts: {error}")
+
+    def _retry_delay(self, attempt: int, retry_after: str = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self._backoff_max)
+            except ValueError:
+                pass
+        delay = min(self._backoff * 2 ** attempt, self._backoff_max)
+        return delay * random.uniform(0.5, 1.5)
+
+    def stats(self) -> dict:
+        stats = dict(self._stats)
+        stats["in_flight"] = self._in_flight
+        stats["max_concurrency"] = self.max_concurrency
+        stats["latency_seconds_avg"] = stats["latency_seconds_total"] / stats["requests"] if stats["requests"] else 0.0
+        return stats
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+
+
+# Shared, process-wide client
+llm_client = LLMClient()
+
 
+async def get_summary_from_llm(prompt: str) -> str:
+    messages = [{"role": "user", "content": f"Summarize the following task updates:\n{prompt}"}]
     try:
-        response = requests.post(LLM_ENDPOINT, headers=headers, json=payload)
-        response.raise_for_status()
-        data = response.json()
-        return data["choices"][0]["message"]["content"]
-    except Exception as e:
+        return await llm_client.chat(messages, SUMMARY_MODEL, max_tokens=300)
+    except LLMError as e:
         return f"Failed to get summary: {str(e)}"
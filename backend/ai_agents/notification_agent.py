@@ -1,68 +1,473 @@
 import os
 from dotenv import load_dotenv
+import logging
 import smtplib
+import threading
+import time
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, case, exists
+from sqlalchemy.orm import Session, aliased
 from database import Session_local
-from models import Task, User
+from models import Task, User, NotificationLog
+from query_options import task_with_assignee
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 EMAIL_SENDER = os.getenv("EMAIL_SENDER")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
 SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
 SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
+# Set to "false" for local/test SMTP servers without STARTTLS (e.g. aiosmtpd)
+SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
+# Connection pool limits
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", 4))
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", 100))
+SMTP_IDLE_TIMEOUT_SECONDS = float(os.getenv("SMTP_IDLE_TIMEOUT_SECONDS", 60))
+# One consolidated email per assignee per sweep instead of one per task
+NOTIFICATION_DIGEST = os.getenv("NOTIFICATION_DIGEST", "false").lower() == "true"
+# Don't resend the same reminder for a task within this window
+NOTIFICATION_RESEND_WINDOW_HOURS = float(os.getenv("NOTIFICATION_RESEND_WINDOW_HOURS", 24))
 
 
-def send_email(recipient: str, subject: str, message: str):
+def build_email(recipient: str, subject: str, message: str):
     msg = MIMEMultipart()
     msg['From'] = EMAIL_SENDER
     msg['To'] = recipient
     msg['Subject'] = subject
 
     msg.attach(MIMEText(message, 'plain'))
+    return msg
 
-    try:
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
+
+def deliver_email(msg, host: str = None, port: int = None, use_tls: bool = None):
+    """
+    Send one message over a fresh SMTP connection. Raises on failure.
+    """
+    host = host or SMTP_SERVER
+    port = port or SMTP_PORT
+    use_tls = SMTP_USE_TLS if use_tls is None else use_tls
+
+    with smtplib.SMTP(host, port, timeout=30) as server:
+        if use_tls:
             server.starttls()
+        if EMAIL_SENDER and EMAIL_PASSWORD:
             server.login(EMAIL_SENDER, EMAIL_PASSWORD)
-            server.send_message(msg)
-            print(f"Email sent to {recipient}")
+        server.send_message(msg)
+
+
+# The server answered and rejected this message; the connection itself is still usable
+SMTP_MESSAGE_REJECTED = (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException)
+
+
+class SMTPSession:
+    """
+    A checked-out pooled connection. `send` reuses the authenticated connection,
+    reconnects once if the server dropped it, and rotates the connection after
+    `max_messages` messages. A rejected message (refused recipient, data error)
+    is raised to the caller and keeps the connection; any other error (timeout,
+    broken socket) drops it, so it is never checked back into the pool.
+    """
+
+    def __init__(self, pool, connection):
+        self._pool = pool
+        self._connection = connection
+
+    def send(self, msg):
+        if self._connection is not None and self._connection["sent"] >= self._pool.max_messages:
+            self._reset()
+        if self._connection is None:
+            self._connection = self._pool._connect()
+
+        try:
+            try:
+                self._connection["smtp"].send_message(msg)
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                # Stale connection: reconnect transparently and try once more
+                self._reset()
+                self._connection = self._pool._connect()
+                self._connection["smtp"].send_message(msg)
+        except SMTP_MESSAGE_REJECTED:
+            raise
+        except Exception:
+            # The connection may be mid-transaction or dead; callers such as
+            # send_email swallow the error, so drop it here
+            self._reset()
+            raise
+
+        self._connection["sent"] += 1
+        self._connection["last_used"] = time.monotonic()
+        with self._pool._lock:
+            self._pool.messages_sent += 1
+
+    def _reset(self):
+        self._pool._close(self._connection)
+        self._connection = None
+
+
+class SMTPPool:
+    """
+    Pool of authenticated SMTP connections shared by the notification sweeps and
+    the email queue, so many messages share one TCP + TLS + AUTH handshake.
+    At most `size` connections are open at once.
+    """
+
+    def __init__(self, host: str = None, port: int = None, use_tls: bool = None, size: int = SMTP_POOL_SIZE,
+                 max_messages: int = SMTP_MAX_MESSAGES_PER_CONNECTION, idle_timeout: float = SMTP_IDLE_TIMEOUT_SECONDS):
+        self.host = host or SMTP_SERVER
+        self.port = port or SMTP_PORT
+        self.use_tls = SMTP_USE_TLS if use_tls is None else use_tls
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = []
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.messages_sent = 0
+
+    @contextmanager
+    def session(self):
+        """
+        Check out one connection for a run of sends, e.g. a whole sweep.
+        """
+        self._slots.acquire()
+        session = SMTPSession(self, self._checkout())
+        try:
+            yield session
+        finally:
+            self._checkin(session._connection)
+            self._slots.release()
+
+    def send(self, msg):
+        with self.session() as session:
+            session.send(msg)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "connections_opened": self.connections_opened,
+                "messages_sent": self.messages_sent,
+                "idle_connections": len(self._idle),
+            }
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._close(connection)
+
+    def _connect(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=30)
+        try:
+            if self.use_tls:
+                smtp.starttls()
+            if EMAIL_SENDER and EMAIL_PASSWORD:
+                smtp.login(EMAIL_SENDER, EMAIL_PASSWORD)
+        except Exception:
+            smtp.close()
+            raise
+        with self._lock:
+            self.connections_opened += 1
+        return {"smtp": smtp, "sent": 0, "last_used": time.monotonic()}
+
+    def _checkout(self):
+        """
+        Reuse a fresh idle connection if there is one; the session connects lazily otherwise.
+        """
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                connection = self._idle.pop()
+            if time.monotonic() - connection["last_used"] < self.idle_timeout:
+                return connection
+            self._close(connection)
+
+    def _checkin(self, connection):
+        if connection is None:
+            return
+        if connection["sent"] >= self.max_messages:
+            self._close(connection)
+            return
+        with self._lock:
+            self._idle.append(connection)
+
+    def _close(self, connection):
+        if connection is None:
+            return
+        try:
+            connection["smtp"].quit()
+        except Exception:
+            connection["smtp"].close()
+
+
+# Shared, process-wide pool
+smtp_pool = SMTPPool()
+
+
+def send_email(recipient: str, subject: str, message: str, session: SMTPSession = None):
+    msg = build_email(recipient, subject, message)
+
+    try:
+        if session is not None:
+            session.send(msg)
+        else:
+            smtp_pool.send(msg)
+        logger.info(f"Email sent to {recipient}")
+        return True
     except Exception as e:
-        print(f"Email failed: {e}")
+        logger.warning(f"Email to {recipient} failed: {str(e)}")
+        return False
 
 # ----- Notification Logic -----
 
+DUE_SOON_WINDOW = timedelta(hours=2)
 
-def notify_due_soon(db: Session):
-    soon = datetime.utcnow() + timedelta(hours=2)
-    tasks = db.query(Task).filter(Task.due_date <= soon, Task.status != "Completed").all()
-    for task in tasks:
-        if task.assignee and task.assignee.email:
-            send_email(
-                recipient=task.assignee.email,
-                subject=f"[Upcoming Task Due] {task.title}",
-                message=f"Reminder: Your task '{task.title}' is due by {task.due_date.strftime('%Y-%m-%d %H:%M')}."
-            )
-
-def notify_overdue(db: Session):
-    now = datetime.utcnow()
-    tasks = db.query(Task).filter(Task.due_date < now, Task.status != "Completed").all()
+
+def _resend_cutoff(now: datetime, window: timedelta = None):
+    return now - (window if window is not None else timedelta(hours=NOTIFICATION_RESEND_WINDOW_HOURS))
+
+
+def not_recently_notified(query, kind, cutoff: datetime):
+    """
+    Anti-join the task query against the ledger: keep only tasks without a
+    `kind` reminder sent since `cutoff`. `kind` may be a SQL expression.
+    """
+    return query.outerjoin(
+        NotificationLog,
+        and_(
+            NotificationLog.task_id == Task.id,
+            NotificationLog.kind == kind,
+            NotificationLog.last_sent_at >= cutoff
+        )
+    ).filter(NotificationLog.id.is_(None))
+
+
+def resend_due(kind, cutoff: datetime):
+    """
+    Tasks whose last `kind` reminder was sent before `cutoff`, i.e. whose
+    resend window has passed. `kind` may be a SQL expression.
+    """
+    # Aliased: the sweep query also outer-joins the ledger, which would swallow this subquery's FROM
+    log = aliased(NotificationLog)
+    return exists().where(
+        log.task_id == Task.id,
+        log.kind == kind,
+        log.last_sent_at < cutoff
+    )
+
+
+def due_soon_window_crossed(now: datetime, since: datetime = None, resend_before: datetime = None):
+    """
+    Tasks that are due within DUE_SOON_WINDOW of `now`; with a `since`
+    watermark, only those that entered that window (or were created) after
+    `since`, plus those last reminded before `resend_before`.
+    """
+    criteria = Task.due_date <= now + DUE_SOON_WINDOW
+    if since is not None:
+        crossed = or_(Task.due_date > since + DUE_SOON_WINDOW, Task.created_at >= since)
+        if resend_before is not None:
+            crossed = or_(crossed, resend_due("due_soon", resend_before))
+        criteria = and_(criteria, crossed)
+    return criteria
+
+
+def overdue_boundary_crossed(now: datetime, since: datetime = None, resend_before: datetime = None):
+    """
+    Tasks past their due date at `now`; with a `since` watermark, only those
+    that became overdue (or were created) after `since`, plus those last
+    reminded before `resend_before`.
+    """
+    criteria = Task.due_date < now
+    if since is not None:
+        crossed = or_(Task.due_date >= since, Task.created_at >= since)
+        if resend_before is not None:
+            crossed = or_(crossed, resend_due("overdue", resend_before))
+        criteria = and_(criteria, crossed)
+    return criteria
+
+
+def record_notifications(db: Session, entries: list, sent_at: datetime):
+    """
+    Upsert `(task_id, kind)` ledger rows with `last_sent_at = sent_at` and commit.
+    """
+    if not entries:
+        return
+    rows = [{"task_id": task_id, "kind": kind, "last_sent_at": sent_at} for task_id, kind in set(entries)]
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(NotificationLog)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[NotificationLog.task_id, NotificationLog.kind],
+            set_={"last_sent_at": stmt.excluded.last_sent_at}
+        )
+        db.execute(stmt, rows)
+    else:
+        for task_id, kind in set(entries):
+            db.query(NotificationLog).filter(
+                NotificationLog.task_id == task_id, NotificationLog.kind == kind
+            ).delete(synchronize_session=False)
+        db.execute(NotificationLog.__table__.insert(), rows)
+    db.commit()
+
+
+def notify_due_soon(db: Session, window: timedelta = None, since: datetime = None, now: datetime = None):
+    now = now or datetime.utcnow()
+    cutoff = _resend_cutoff(now, window)
+    tasks = not_recently_notified(
+        db.query(Task).options(task_with_assignee()).filter(due_soon_window_crossed(now, since, cutoff), Task.status != "Completed"),
+        "due_soon", cutoff
+    ).all()
+    sent = []
+    failed = 0
+    with smtp_pool.session() as smtp:
+        for task in tasks:
+            if task.assignee and task.assignee.email:
+                if send_email(
+                    recipient=task.assignee.email,
+                    subject=f"[Upcoming Task Due] {task.title}",
+                    message=f"Reminder: Your task '{task.title}' is due by {task.due_date.strftime('%Y-%m-%d %H:%M')}.",
+                    session=smtp
+                ):
+                    sent.append((task.id, "due_soon"))
+                else:
+                    failed += 1
+    task_ids = {task.id for task in tasks}   # before the ledger commit expires the rows
+    record_notifications(db, sent, now)
+    return {"tasks": len(tasks), "emails": len(sent), "failed": failed, "task_ids": task_ids}
+
+def notify_overdue(db: Session, window: timedelta = None, since: datetime = None, now: datetime = None):
+    now = now or datetime.utcnow()
+    cutoff = _resend_cutoff(now, window)
+    tasks = not_recently_notified(
+        db.query(Task).options(task_with_assignee()).filter(overdue_boundary_crossed(now, since, cutoff), Task.status != "Completed"),
+        "overdue", cutoff
+    ).all()
+    sent = []
+    failed = 0
+    with smtp_pool.session() as smtp:
+        for task in tasks:
+            if task.assignee and task.assignee.email:
+                if send_email(
+                    recipient=task.assignee.email,
+                    subject=f"[Overdue Task] {task.title}",
+                    message=f"The task '{task.title}' is overdue. Please take necessary action.",
+                    session=smtp
+                ):
+                    sent.append((task.id, "overdue"))
+                else:
+                    failed += 1
+    task_ids = {task.id for task in tasks}   # before the ledger commit expires the rows
+    record_notifications(db, sent, now)
+    return {"tasks": len(tasks), "emails": len(sent), "failed": failed, "task_ids": task_ids}
+
+def notify_digest(db: Session, window: timedelta = None, since: datetime = None, now: datetime = None):
+    """
+    Send one consolidated email per assignee covering all of their overdue and
+    due-soon tasks. A single query fetches both, skipping tasks whose reminder
+    of that kind is in the ledger, and the results are grouped by assignee in
+    one pass.
+    """
+    now = now or datetime.utcnow()
+    cutoff = _resend_cutoff(now, window)
+    kind = case((Task.due_date < now, "overdue"), else_="due_soon")
+    tasks = not_recently_notified(
+        db.query(Task).options(task_with_assignee()).filter(
+            or_(due_soon_window_crossed(now, since, cutoff), overdue_boundary_crossed(now, since, cutoff)),
+            Task.status != "Completed"
+        ),
+        kind, cutoff
+    ).all()
+
+    digests = {}
+    per_task_emails = 0
     for task in tasks:
-        if task.assignee and task.assignee.email:
-            send_email(
-                recipient=task.assignee.email,
-                subject=f"[Overdue Task] {task.title}",
-                message=f"The task '{task.title}' is overdue. Please take necessary action."
-            )
+        if not (task.assignee and task.assignee.email):
+            continue
+        digest = digests.setdefault(task.assignee_id, {"user": task.assignee, "overdue": [], "due_soon": []})
+        if task.due_date < now:
+            digest["overdue"].append(task)
+        else:
+            digest["due_soon"].append(task)
+        per_task_emails += 1
+
+    sent = []
+    emails = 0
+    failed = 0
+    with smtp_pool.session() as smtp:
+        for digest in digests.values():
+            user = digest["user"]
+            lines = [f"Hello {user.username},", ""]
+            if digest["overdue"]:
+                lines.append(f"Overdue tasks ({len(digest['overdue'])}):")
+                lines += [f"  - {t.title} (was due {t.due_date.strftime('%Y-%m-%d %H:%M')})" for t in digest["overdue"]]
+                lines.append("")
+            if digest["due_soon"]:
+                lines.append(f"Due soon ({len(digest['due_soon'])}):")
+                lines += [f"  - {t.title} (due {t.due_date.strftime('%Y-%m-%d %H:%M')})" for t in digest["due_soon"]]
+                lines.append("")
+            lines += ["Please take necessary action.", "", "Best,", "TaskBot"]
+
+            if send_email(
+                recipient=user.email,
+                subject=f"[Task Digest] {len(digest['overdue'])} overdue, {len(digest['due_soon'])} due soon",
+                message="\n".join(lines),
+                session=smtp
+            ):
+                emails += 1
+                sent += [(t.id, "overdue") for t in digest["overdue"]]
+                sent += [(t.id, "due_soon") for t in digest["due_soon"]]
+            else:
+                failed += 1
+
+    record_notifications(db, sent, now)
+    return {
+        "tasks": len(tasks),
+        "emails": emails,
+        "failed": failed,
+        "emails_saved": per_task_emails - len(digests),
+    }
 
 # ----- Run All Notifications -----
-def run_notifications():
+def run_notifications(digest: bool = None, window: timedelta = None, since: datetime = None, now: datetime = None):
+    """
+    Run one notification sweep. `digest` sends one email per assignee instead of
+    one per task; it defaults to the NOTIFICATION_DIGEST environment variable.
+    Reminders already sent within `window` (NOTIFICATION_RESEND_WINDOW_HOURS by
+    default) are skipped. With a `since` watermark only tasks whose due-soon or
+    overdue boundary was crossed between `since` and `now`, or whose last
+    reminder is older than `window`, are considered.
+    Returns a report of tasks seen, emails sent, failed sends and (in digest
+    mode) emails saved.
+    """
+    digest = NOTIFICATION_DIGEST if digest is None else digest
+    now = now or datetime.utcnow()
     db = Session_local()
     try:
-        notify_due_soon(db)
-        notify_overdue(db)
+        if digest:
+            report = notify_digest(db, window, since, now)
+        else:
+            due_soon = notify_due_soon(db, window, since, now)
+            overdue = notify_overdue(db, window, since, now)
+            report = {
+                "tasks": len(due_soon["task_ids"] | overdue["task_ids"]),
+                "emails": due_soon["emails"] + overdue["emails"],
+                "failed": due_soon["failed"] + overdue["failed"],
+                "emails_saved": 0,
+            }
     finally:
         db.close()
+
+    report["mode"] = "digest" if digest else "per_task"
+    logger.info(f"Notification sweep ({report['mode']}): {report['emails']} emails for {report['tasks']} tasks, "
+                f"{report['failed']} failed, {report['emails_saved']} emails saved")
+    return report
@@ -0,0 +1,113 @@
+# notification_scheduler.py
+
+import os
+import threading
+import time
+import logging
+from datetime import datetime
+from ai_agents.notification_agent import run_notifications
+from ai_agents.scheduler_lease import DatabaseLease
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_SCHEDULER_ENABLED = os.getenv("NOTIFICATION_SCHEDULER_ENABLED", "true").lower() == "true"
+NOTIFICATION_INTERVAL_SECONDS = float(os.getenv("NOTIFICATION_INTERVAL_SECONDS", 300))
+# How long one process may hold the sweep before another may take over; longer than any sweep
+NOTIFICATION_LEASE_SECONDS = float(os.getenv("NOTIFICATION_LEASE_SECONDS", 900))
+
+
+class NotificationScheduler:
+    """
+    Runs `run_notifications` on a fixed interval in a background thread.
+
+    The first sweep after start-up considers every task; each later sweep only
+    considers tasks whose due-soon/overdue boundary was crossed since the
+    previous sweep's watermark. The watermark only advances after a sweep in
+    which every send succeeded, so tasks whose reminder failed stay eligible
+    (the ledger keeps the delivered ones from being resent). A sweep that is
+    still running when the next one is due is not overlapped; the next tick is
+    skipped instead. With a `lease`, sweeps are also not overlapped across
+    processes (e.g. several uvicorn workers): the ledger is only written after
+    sending, so parallel sweeps would send the same reminders.
+    """
+
+    def __init__(self, interval: float = NOTIFICATION_INTERVAL_SECONDS, sweep=run_notifications, lease: DatabaseLease = None):
+        self.interval = interval
+        self._sweep = sweep
+        self._lease = lease
+        self._watermark = None
+        self._running_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_report = None
+
+    @property
+    def watermark(self):
+        return self._watermark
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="notification-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"Notification scheduler started, interval {self.interval:.0f}s")
+
+    def stop(self, timeout: float = 30):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        logger.info("Notification scheduler stopped")
+
+    def run_once(self):
+        """
+        Run a single sweep now. Returns its report, or None if a sweep is already
+        running here or in another process.
+        """
+        if not self._running_lock.acquire(blocking=False):
+            logger.warning("Notification sweep still running, skipping this run")
+            return None
+        leased = False
+        try:
+            if self._lease is not None:
+                leased = self._lease.acquire()
+                if not leased:
+                    logger.info("Notification sweep running in another process, skipping this run")
+                    return None
+            now = datetime.utcnow()
+            since = self._watermark
+            started = time.monotonic()
+            report = self._sweep(since=since, now=now)
+            # Failed sends return False rather than raising: keep their tasks in the next sweep's range
+            if report.get("failed"):
+                logger.warning(f"{report['failed']} notification emails failed, keeping the watermark "
+                               f"at {since.isoformat() if since else 'start'}")
+            else:
+                self._watermark = now
+            report["duration_seconds"] = time.monotonic() - started
+            report["since"] = since.isoformat() if since else None
+            self.last_report = report
+            logger.info(f"Notification sweep since {report['since'] or 'start'} took "
+                        f"{report['duration_seconds'] * 1000:.0f} ms: {report['tasks']} tasks, "
+                        f"{report['emails']} emails, {report.get('failed', 0)} failed")
+            return report
+        except Exception as e:
+            logger.error(f"Notification sweep failed: {str(e)}")
+            return None
+        finally:
+            if leased:
+                try:
+                    self._lease.release()
+                except Exception as e:
+                    logger.warning(f"Releasing the notification sweep lease failed: {str(e)}")
+            self._running_lock.release()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+
+# Shared, process-wide scheduler
+notification_scheduler = NotificationScheduler(lease=DatabaseLease("notification_sweep", NOTIFICATION_LEASE_SECONDS))
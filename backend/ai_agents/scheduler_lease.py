@@ -0,0 +1,63 @@
+# scheduler_lease.py
+
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import update, or_
+from sqlalchemy.exc import IntegrityError
+from database import Session_local
+from models import SchedulerLease
+
+
+class DatabaseLease:
+    """
+    A named, expiring lease in the scheduler_leases table, so a periodic job
+    runs in one process at a time even with several API workers (or a CLI run)
+    sharing the database. Taking the lease is a single conditional UPDATE (or
+    the INSERT of its row), which the database serializes.
+
+    The lease expires after `ttl` seconds so a crashed holder cannot block the
+    job forever; `ttl` should exceed the job's longest run.
+    """
+
+    def __init__(self, name: str, ttl: float, session_factory=Session_local):
+        self.name = name
+        self.ttl = ttl
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._session_factory = session_factory
+
+    def acquire(self) -> bool:
+        """Take the lease if it is free, expired or already ours. Returns whether we hold it."""
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.ttl)
+        with self._session_factory() as db:
+            taken = db.execute(
+                update(SchedulerLease)
+                .where(
+                    SchedulerLease.name == self.name,
+                    or_(SchedulerLease.expires_at < now, SchedulerLease.holder == self.holder)
+                )
+                .values(holder=self.holder, expires_at=expires_at)
+            ).rowcount
+            if not taken:
+                db.add(SchedulerLease(name=self.name, holder=self.holder, expires_at=expires_at))
+                try:
+                    db.commit()
+                except IntegrityError:
+                    # Another process holds the lease
+                    db.rollback()
+                    return False
+            else:
+                db.commit()
+        return True
+
+    def release(self):
+        """Expire the lease now, if we still hold it."""
+        with self._session_factory() as db:
+            db.execute(
+                update(SchedulerLease)
+                .where(SchedulerLease.name == self.name, SchedulerLease.holder == self.holder)
+                .values(expires_at=datetime.utcnow())
+            )
+            db.commit()
@@ -0,0 +1,169 @@
+# skill_index.py
+
+import os
+import threading
+import time
+import logging
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from models import EmployeeProfile
+
+logger = logging.getLogger(__name__)
+
+# Rebuild from the database at least this often, to pick up skill edits made outside this process
+SKILL_INDEX_MAX_AGE_SECONDS = float(os.getenv("SKILL_INDEX_MAX_AGE_SECONDS", 300))
+
+
+def available_profile_rows(db: Session):
+    """
+    Return `(profile_id, user_id, normalized_skills)` for every available employee profile.
+    """
+    from ai_agents.assignment_agent import normalize_skills
+
+    rows = db.query(
+        EmployeeProfile.id, EmployeeProfile.user_id, EmployeeProfile.skills
+    ).filter(EmployeeProfile.is_available.is_(True)).all()
+
+    return [
+        (profile_id, user_id, normalize_skills(skills) if skills else [])
+        for profile_id, user_id, skills in rows
+    ]
+
+
+def available_profiles_version(db: Session):
+    """
+    `(count, sum of ids)` of the available employee profiles: one aggregate
+    query that changes whenever a profile becomes available or unavailable,
+    in this process or any other.
+    """
+    count, id_sum = db.query(
+        func.count(EmployeeProfile.id), func.coalesce(func.sum(EmployeeProfile.id), 0)
+    ).filter(EmployeeProfile.is_available.is_(True)).one()
+    return int(count), int(id_sum)
+
+
+class SkillIndex:
+    """
+    In-process inverted index of normalized skill -> available employee profile ids.
+
+    The index is built from the database and then kept up to date by the code
+    paths in this process that change a profile's availability or skills
+    (registration, auto-assignment and release), so matching only touches
+    profiles that share at least one required skill instead of scanning every
+    available employee. `ensure_built` rebuilds it when the available profiles
+    in the database no longer match its contents (changed by another worker,
+    a script or a migration) and every SKILL_INDEX_MAX_AGE_SECONDS.
+    """
+
+    def __init__(self, max_age: float = SKILL_INDEX_MAX_AGE_SECONDS):
+        self._lock = threading.RLock()
+        self._built = False
+        self._built_at = 0.0
+        self.max_age = max_age
+        self._by_skill = {}     # skill -> set(profile_id)
+        self._profiles = {}     # profile_id -> {'user_id': ..., 'skills': frozenset}
+        self._id_sum = 0
+
+    @property
+    def built(self):
+        return self._built
+
+    def build(self, db: Session):
+        """
+        (Re)build the index from every available employee profile.
+        """
+        self.load(available_profile_rows(db))
+        logger.info(f"Skill index built with {len(self._profiles)} available profiles "
+                    f"and {len(self._by_skill)} distinct skills")
+
+    def load(self, rows):
+        """
+        Replace the index contents with `(profile_id, user_id, normalized_skills)` rows.
+        """
+        with self._lock:
+            self._by_skill = {}
+            self._profiles = {}
+            self._id_sum = 0
+            for profile_id, user_id, skills in rows:
+                self._add(profile_id, user_id, skills)
+            self._built = True
+            self._built_at = time.monotonic()
+
+    def version(self):
+        """`(count, sum of ids)` of the indexed profiles; compare with `available_profiles_version`."""
+        with self._lock:
+            return len(self._profiles), self._id_sum
+
+    def ensure_built(self, db: Session):
+        """
+        Build the index on first use, and rebuild it when it is older than
+        `max_age` or no longer holds the same available profiles as the database.
+        """
+        version = available_profiles_version(db)
+        with self._lock:
+            if self._built and time.monotonic() - self._built_at < self.max_age and self.version() == version:
+                return
+            self.build(db)
+
+    def add(self, profile_id: int, user_id: int, skills: list):
+        """
+        Add (or replace) an available profile. `skills` must already be normalized.
+        """
+        with self._lock:
+            if not self._built:
+                # Will be picked up by the initial build
+                return
+            self._remove(profile_id)
+            self._add(profile_id, user_id, skills)
+
+    def remove(self, profile_id: int):
+        """
+        Drop a profile from the index, e.g. once it is no longer available.
+        """
+        with self._lock:
+            self._remove(profile_id)
+
+    def clear(self):
+        with self._lock:
+            self._by_skill = {}
+            self._profiles = {}
+            self._id_sum = 0
+            self._built = False
+
+    def candidates(self, required_skills: list):
+        """
+        Return {profile_id: set(matching_skills)} for every indexed profile
+        sharing at least one of the (normalized) required skills.
+        """
+        matches = {}
+        with self._lock:
+            for skill in set(required_skills):
+                for profile_id in self._by_skill.get(skill, ()):
+                    matches.setdefault(profile_id, set()).add(skill)
+        return matches
+
+    def __len__(self):
+        return len(self._profiles)
+
+    def _add(self, profile_id, user_id, skills):
+        skills = frozenset(skills)
+        self._profiles[profile_id] = {'user_id': user_id, 'skills': skills}
+        self._id_sum += profile_id
+        for skill in skills:
+            self._by_skill.setdefault(skill, set()).add(profile_id)
+
+    def _remove(self, profile_id):
+        entry = self._profiles.pop(profile_id, None)
+        if not entry:
+            return
+        self._id_sum -= profile_id
+        for skill in entry['skills']:
+            ids = self._by_skill.get(skill)
+            if ids is not None:
+                ids.discard(profile_id)
+                if not ids:
+                    del self._by_skill[skill]
+
+
+# Shared, process-wide index
+skill_index = SkillIndex()
@@ -0,0 +1,223 @@
+# skill_matrix.py
+
+import threading
+import time
+import logging
+import numpy as np
+from sqlalchemy.orm import Session
+from ai_agents.skill_index import available_profile_rows, available_profiles_version, SKILL_INDEX_MAX_AGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+WORD_BITS = 64
+
+
+class SkillMatrix:
+    """
+    Bitset skill matrix over a growing skill vocabulary.
+
+    Each available employee profile is one row of packed uint64 words where bit
+    `j` is set when the employee has vocabulary skill `j`. Scoring a task is a
+    single vectorized AND + popcount of the required-skills bitset against every
+    row, producing the same `(match_score, match_percentage)` ranking as
+    `match_employees_by_skills`. Like `SkillIndex`, `ensure_built` rebuilds it
+    when it is older than `max_age` or out of step with the database.
+    """
+
+    def __init__(self, initial_capacity: int = 1024, max_age: float = SKILL_INDEX_MAX_AGE_SECONDS):
+        self._lock = threading.RLock()
+        self._built = False
+        self._built_at = 0.0
+        self.max_age = max_age
+        self._initial_capacity = initial_capacity
+        self._reset()
+
+    def _reset(self):
+        self.vocabulary = {}                    # skill -> bit position
+        self._bits = np.zeros((self._initial_capacity, 1), dtype=np.uint64)
+        self._profile_ids = np.zeros(self._initial_capacity, dtype=np.int64)
+        self._active = np.zeros(self._initial_capacity, dtype=bool)
+        self._row_of = {}                       # profile_id -> row
+        self._free_rows = []
+        self._size = 0                          # rows ever used (high-water mark)
+        self._id_sum = 0
+
+    @property
+    def built(self):
+        return self._built
+
+    def build(self, db: Session):
+        """
+        (Re)build the matrix from every available employee profile.
+        """
+        self.load(available_profile_rows(db))
+        logger.info(f"Skill matrix built with {len(self._row_of)} available profiles "
+                    f"and {len(self.vocabulary)} distinct skills")
+
+    def load(self, rows):
+        """
+        Replace the matrix contents with `(profile_id, user_id, normalized_skills)` rows.
+        """
+        rows = list(rows)
+        with self._lock:
+            self._reset()
+            for skills in (r[2] for r in rows):
+                for skill in skills:
+                    self._column(skill)
+            self._grow_rows(len(rows))
+
+            for row, (profile_id, user_id, skills) in enumerate(rows):
+                self._bits[row] = self._encode(skills)
+                self._profile_ids[row] = profile_id
+                self._active[row] = True
+                self._row_of[profile_id] = row
+                self._id_sum += profile_id
+            self._size = len(rows)
+            self._built = True
+            self._built_at = time.monotonic()
+
+    def version(self):
+        """`(count, sum of ids)` of the active profiles; compare with `available_profiles_version`."""
+        with self._lock:
+            return len(self._row_of), self._id_sum
+
+    def ensure_built(self, db: Session):
+        """
+        Build the matrix on first use, and rebuild it when it is older than
+        `max_age` or no longer holds the same available profiles as the database.
+        """
+        version = available_profiles_version(db)
+        with self._lock:
+            if self._built and time.monotonic() - self._built_at < self.max_age and self.version() == version:
+                return
+            self.build(db)
+
+    def add(self, profile_id: int, user_id: int, skills: list):
+        """
+        Add (or replace) an available profile. `skills` must already be normalized.
+        """
+        with self._lock:
+            if not self._built:
+                # Will be picked up by the initial build
+                return
+            row = self._row_of.get(profile_id)
+            if row is None:
+                if self._free_rows:
+                    row = self._free_rows.pop()
+                else:
+                    self._grow_rows(self._size + 1)
+                    row = self._size
+                    self._size += 1
+                self._row_of[profile_id] = row
+                self._id_sum += profile_id
+
+            self._bits[row] = self._encode(skills)
+            self._profile_ids[row] = profile_id
+            self._active[row] = True
+
+    def remove(self, profile_id: int):
+        """
+        Drop a profile from the matrix, e.g. once it is no longer available.
+        """
+        with self._lock:
+            row = self._row_of.pop(profile_id, None)
+            if row is None:
+                return
+            self._id_sum -= profile_id
+            self._active[row] = False
+            self._bits[row] = 0
+            self._free_rows.append(row)
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+            self._built = False
+
+    def encode(self, skills: list):
+        """
+        Pack normalized skills into a bitset row. Skills outside the vocabulary are ignored.
+        """
+        with self._lock:
+            return self._encode(skills, grow=False)
+
+    def scores(self, required_skills: list):
+        """
+        Return `(profile_ids, match_scores)` for every active row, computed in one
+        vectorized AND + popcount over the whole matrix.
+        """
+        with self._lock:
+            required = self._encode(required_skills, grow=False)
+            bits = self._bits[:self._size]
+            counts = np.bitwise_count(bits & required).sum(axis=1, dtype=np.int64)
+            counts[~self._active[:self._size]] = 0
+            return self._profile_ids[:self._size].copy(), counts
+
+    def snapshot(self):
+        """
+        Return `(profile_ids, bits)` copies of the active rows.
+        """
+        with self._lock:
+            active = np.flatnonzero(self._active[:self._size])
+            return self._profile_ids[active].copy(), self._bits[active].copy()
+
+    def rank(self, required_skills: list):
+        """
+        Rank available profiles against the (normalized) required skills.
+
+        Returns a list of `(profile_id, match_score, match_percentage)` for every
+        profile sharing at least one skill, best first; ties break on profile id.
+        `match_percentage` uses `len(required_skills)` like the Python matcher.
+        """
+        if not required_skills:
+            return []
+
+        profile_ids, counts = self.scores(required_skills)
+        hits = np.flatnonzero(counts > 0)
+        if hits.size == 0:
+            return []
+
+        order = hits[np.lexsort((profile_ids[hits], -counts[hits]))]
+        percentages = counts[order] / len(required_skills) * 100
+        return list(zip(profile_ids[order].tolist(), counts[order].tolist(), percentages.tolist()))
+
+    def __len__(self):
+        return len(self._row_of)
+
+    def _column(self, skill):
+        column = self.vocabulary.get(skill)
+        if column is None:
+            column = len(self.vocabulary)
+            self.vocabulary[skill] = column
+            words_needed = column // WORD_BITS + 1
+            if words_needed > self._bits.shape[1]:
+                extra = words_needed - self._bits.shape[1]
+                self._bits = np.hstack([self._bits, np.zeros((self._bits.shape[0], extra), dtype=np.uint64)])
+        return column
+
+    def _encode(self, skills, grow=True):
+        skills = set(skills)
+        if grow:
+            for skill in skills:
+                self._column(skill)
+        row = np.zeros(self._bits.shape[1], dtype=np.uint64)
+        for skill in skills:
+            column = self.vocabulary.get(skill)
+            if column is None:
+                continue
+            row[column // WORD_BITS] |= np.uint64(1) << np.uint64(column % WORD_BITS)
+        return row
+
+    def _grow_rows(self, rows_needed):
+        capacity = max(self._bits.shape[0], 1)
+        if rows_needed <= capacity:
+            return
+        while capacity < rows_needed:
+            capacity *= 2
+        extra = capacity - self._bits.shape[0]
+        self._bits = np.vstack([self._bits, np.zeros((extra, self._bits.shape[1]), dtype=np.uint64)])
+        self._profile_ids = np.concatenate([self._profile_ids, np.zeros(extra, dtype=np.int64)])
+        self._active = np.concatenate([self._active, np.zeros(extra, dtype=bool)])
+
+
+# Shared, process-wide matrix
+skill_matrix = SkillMatrix()
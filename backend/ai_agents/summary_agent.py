@@ -1,38 +1,36 @@
 import os
-import requests
+import json
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, and_, func, select
 from models import Task  # ✅ your SQLAlchemy Task model
-from openai import OpenAI
+from schemas import TaskStatus
+from query_options import count_where
+from ai_agents.llm_client import llm_client
 
 
-API_KEY = os.getenv("TOGETHER_API_KEY")
+LLM_MODEL = os.getenv("LLM_MODEL", "mistralai/Mistral-7B-Instruct-v0.2")
+# Bump whenever create_summary_prompt or the system message changes, so cached summaries are not reused
+PROMPT_VERSION = "2"
 
-client = OpenAI(
-    api_key=API_KEY,
-    base_url="https://api.together.xyz/v1",
-)
 
+def summary_task_filter(today):
+    """Tasks that count towards today's summary: created or status-updated today."""
+    return or_(
+        Task.created_at >= today,
+        Task.status_updated_at >= today
+    )
 
-def fetch_tasks_for_summary(db: Session, user_id: int):
-    today = datetime.utcnow().date()
-    now = datetime.utcnow()
-
-    tasks = db.query(Task).filter(
-        Task.assignee_id == user_id,
-        or_(
-            Task.created_at >= today,
-            Task.status_updated_at >= today
-        )
-    ).all()
 
+def build_summary_data(tasks: list, now: datetime):
+    today = now.date()
     all_tasks_data = []
     overdue = []
     upcoming = []
     stagnant = []
 
-    for task in tasks:
+    # Stable order, so the same tasks always produce the same data
+    for task in sorted(tasks, key=lambda t: t.id):
         task_info = {
             "id": task.id,
             "title": task.title,
@@ -61,17 +59,73 @@ def fetch_tasks_for_summary(db: Session, user_id: int):
     }
 
 
-def create_summary_prompt(data: dict, employee_name: str):
+def fetch_tasks_for_summary(db: Session, user_id: int):
+    now = datetime.utcnow()
+
+    tasks = db.query(Task).filter(
+        Task.assignee_id == user_id,
+        summary_task_filter(now.date())
+    ).all()
+
+    return build_summary_data(tasks, now)
+
+
+def summary_counts_statement(user_ids: list, now: datetime):
+    """
+    One GROUP BY over today's tasks of `user_ids`: totals, per-status totals and
+    the overdue/upcoming/stagnant counts, with the same predicates as
+    `build_summary_data` (statuses compared exactly, as stored).
+    """
+    today = now.date()
+    return select(
+        Task.assignee_id,
+        func.count(Task.id).label("total_tasks"),
+        count_where(Task.due_date < now).label("overdue"),
+        count_where(and_(Task.due_date >= now, Task.due_date <= now + timedelta(days=2))).label("upcoming"),
+        count_where(and_(Task.status == TaskStatus.PENDING.value, Task.status_updated_at < today)).label("stagnant"),
+        *(count_where(Task.status == s.value).label(s.value) for s in TaskStatus)
+    ).where(
+        Task.assignee_id.in_(user_ids),
+        summary_task_filter(today)
+    ).group_by(Task.assignee_id)
+
+
+def fetch_summary_counts(db: Session, user_ids: list):
+    """
+    Summary counts for several employees from a single aggregate query, keyed
+    by user id (employees without tasks today get zeros). This is all the
+    summary prompt uses, so no task rows are loaded.
+    """
+    if not user_ids:
+        return {}
+
+    rows = {row["assignee_id"]: row for row in db.execute(summary_counts_statement(user_ids, datetime.utcnow())).mappings()}
+    counts = {}
+    for user_id in user_ids:
+        row = rows.get(user_id, {})
+        counts[user_id] = {
+            "total_tasks": row.get("total_tasks", 0),
+            "overdue": row.get("overdue", 0),
+            "upcoming": row.get("upcoming", 0),
+            "stagnant": row.get("stagnant", 0),
+            "by_status": {s.value: row.get(s.value, 0) for s in TaskStatus}
+        }
+    return counts
+
+
+def create_summary_prompt(counts: dict, employee_name: str):
+    by_status = ", ".join(f"{status}: {count}" for status, count in counts["by_status"].items())
     prompt = f"""
 You are a smart assistant helping managers with daily task summaries for their employees.
 
 Employee: {employee_name}
 
 Summary Data:
-- Total Tasks: {len(data['all_tasks'])}
-- Overdue Tasks: {len(data['overdue'])}
-- Upcoming Deadlines (next 2 days): {len(data['upcoming'])}
-- Pending Tasks not updated today: {len(data['stagnant'])}
+- Total Tasks: {counts['total_tasks']}
+- By Status: {by_status}
+- Overdue Tasks: {counts['overdue']}
+- Upcoming Deadlines (next 2 days): {counts['upcoming']}
+- Pending Tasks not updated today: {counts['stagnant']}
 
 Now generate a helpful daily summary in JSON with the following structure:
 {{
@@ -88,31 +142,23 @@ Be concise but informative. Mention urgent tasks and suggest follow-up actions.
     return prompt
 
 
-def call_llm(prompt: str) -> dict:
-    headers = {
-        "Authorization": f"Bearer {os.getenv('ALLTOGETHER_API_KEY')}",
-        "Content-Type": "application/json"
-    }
-
-    payload = {
-        "model": "gpt-4",
-        "messages": [{"role": "user", "content": prompt}],
-        "temperature": 0.7
-    }
+async def call_llm(prompt: str) -> dict:
+    """
+    Ask the LLM for the summary JSON through the shared async client.
+    Raises LLMError when the provider keeps failing.
+    """
+    message = await llm_client.chat(
+        [
+            {"role": "system", "content": "You are a smart assistant helping managers with daily task summaries for their employees."},
+            {"role": "user", "content": prompt}
+        ],
+        model=LLM_MODEL,
+        max_tokens=512,
+        temperature=0.7
+    )
 
-    response = client.chat.completions.create(
-                model="mistralai/Mistral-7B-Instruct-v0.2",
-                messages=[
-                    {"role": "system", "content": "You are a smart assistant helping managers with daily task summaries for their employees."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=512,
-                temperature=0.7
-            )
-
-    message = response.choices[0].message.content
-    
     try:
-        return eval(message) if message.strip().startswith("{") else {"raw": message}
-    except Exception:
+        summary = json.loads(message)
+        return summary if isinstance(summary, dict) else {"raw": message}
+    except ValueError:
         return {"raw": message}
@@ -0,0 +1,127 @@
+# summary_cache.py
+
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from cache import TTLCache
+
+SUMMARY_CACHE_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE", 1000))
+SUMMARY_CACHE_TTL_SECONDS = float(os.getenv("SUMMARY_CACHE_TTL_SECONDS", 24 * 3600))
+# Optional persistent tier, e.g. "summary_cache.db"; empty keeps the cache in memory only
+SUMMARY_CACHE_PATH = os.getenv("SUMMARY_CACHE_PATH", "")
+
+
+def summary_cache_key(counts: dict, employee_name: str, model: str, prompt_version: str) -> str:
+    """
+    Content address of a summary: any change to the employee's summary counts
+    (see fetch_summary_counts), the model or the prompt yields a new key, so
+    entries never need invalidating.
+    """
+    # The material keeps its "tasks" field name so keys stored before the rename stay valid
+    material = json.dumps(
+        {"tasks": counts, "employee": employee_name, "model": model, "prompt_version": prompt_version},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class SummaryCache:
+    """
+    Two-tier cache of generated summaries: an in-memory LRU in front of an
+    optional SQLite file that survives restarts. Disk hits are promoted to memory.
+    Both tiers apply `ttl` and `maxsize`; the SQLite tier evicts the oldest
+    entries first.
+    """
+
+    def __init__(self, maxsize: int = SUMMARY_CACHE_SIZE, ttl: float = SUMMARY_CACHE_TTL_SECONDS,
+                 path: str = SUMMARY_CACHE_PATH):
+        self._memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._path = path
+        self._db = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "refreshes": 0}
+
+    def _connection(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self._path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS summary_cache "
+                "(key TEXT PRIMARY KEY, summary TEXT NOT NULL, created_at TEXT NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS ix_summary_cache_created_at ON summary_cache (created_at)")
+        return self._db
+
+    def _expiry_cutoff(self) -> str:
+        return (datetime.utcnow() - timedelta(seconds=self._ttl)).isoformat()
+
+    def get(self, key: str):
+        summary = self._memory.get(key)
+        if summary is not None:
+            self._count("hits", "memory_hits")
+            return summary
+
+        if self._path:
+            with self._lock:
+                row = self._connection().execute(
+                    "SELECT summary FROM summary_cache WHERE key = ? AND created_at > ?", (key, self._expiry_cutoff())
+                ).fetchone()
+            if row:
+                summary = json.loads(row[0])
+                self._memory.set(key, summary)
+                self._count("hits", "disk_hits")
+                return summary
+
+        self._count("misses")
+        return None
+
+    def set(self, key: str, summary: dict):
+        self._memory.set(key, summary)
+        if self._path:
+            with self._lock:
+                db = self._connection()
+                db.execute(
+                    "INSERT OR REPLACE INTO summary_cache (key, summary, created_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(summary), datetime.utcnow().isoformat())
+                )
+                # Expired entries first, then the oldest beyond maxsize
+                db.execute("DELETE FROM summary_cache WHERE created_at <= ?", (self._expiry_cutoff(),))
+                db.execute(
+                    "DELETE FROM summary_cache WHERE key NOT IN "
+                    "(SELECT key FROM summary_cache ORDER BY created_at DESC, rowid DESC LIMIT ?)",
+                    (max(self._maxsize, 0),)
+                )
+                db.commit()
+        self._count("stores")
+
+    def record_refresh(self):
+        self._count("refreshes")
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["memory_size"] = len(self._memory)
+        stats["persistent"] = bool(self._path)
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _count(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._stats[key] += 1
+
+
+# Shared, process-wide cache
+summary_cache = SummaryCache()
@@ -0,0 +1,214 @@
+# summary_pipeline.py
+"""
+Pre-computes employee daily summaries into the daily_summaries table so the
+summary routes can serve them without waiting on the LLM.
+
+Run it once from the backend directory:
+
+    python -m ai_agents.summary_pipeline [--employee-id 3 ...] [--force]
+
+or let `summary_scheduler` run it periodically inside the API process
+(SUMMARY_PIPELINE_ENABLED=true).
+"""
+
+import os
+import asyncio
+import argparse
+import json
+import logging
+import time
+from datetime import datetime, date
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from database import AsyncSession_local
+from models import User, DailySummary
+from ai_agents.summary_agent import (
+    fetch_summary_counts, create_summary_prompt, call_llm, LLM_MODEL, PROMPT_VERSION
+)
+from ai_agents.summary_cache import summary_cache, summary_cache_key
+from ai_agents.llm_client import LLMError
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PIPELINE_ENABLED = os.getenv("SUMMARY_PIPELINE_ENABLED", "false").lower() == "true"
+SUMMARY_PIPELINE_INTERVAL_SECONDS = float(os.getenv("SUMMARY_PIPELINE_INTERVAL_SECONDS", 3600))
+SUMMARY_PIPELINE_CONCURRENCY = int(os.getenv("SUMMARY_PIPELINE_CONCURRENCY", 4))
+
+
+async def load_daily_summaries(db, content_hashes: dict, day: date = None):
+    """
+    Materialized summaries for `{user_id: content_hash}`, keyed by user id.
+    Only rows for `day` (today by default) built from the same task counts are returned.
+    """
+    if not content_hashes:
+        return {}
+    day = day or datetime.utcnow().date()
+    rows = await db.scalars(select(DailySummary).where(
+        DailySummary.user_id.in_(content_hashes),
+        DailySummary.summary_date == day
+    ))
+    return {row.user_id: row.summary for row in rows if row.content_hash == content_hashes[row.user_id]}
+
+
+def upsert_daily_summary(dialect: str, **values):
+    """
+    INSERT of one daily_summaries row that overwrites the row already stored
+    for the same (user_id, summary_date), e.g. by a concurrent pipeline run.
+    """
+    insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+    statement = insert(DailySummary).values(**values)
+    return statement.on_conflict_do_update(
+        index_elements=[DailySummary.user_id, DailySummary.summary_date],
+        set_={column: statement.excluded[column] for column in ("content_hash", "summary", "generated_at")}
+    )
+
+
+async def run_summary_pipeline(employee_ids: list = None, force: bool = False,
+                               concurrency: int = SUMMARY_PIPELINE_CONCURRENCY, session_factory=AsyncSession_local):
+    """
+    Generate today's summary for every employee (or `employee_ids`) whose task
+    counts changed since their last materialized summary, or for all of them
+    with `force`. Returns a report of what was generated, skipped and failed.
+    """
+    started = time.monotonic()
+    day = datetime.utcnow().date()
+    report = {"date": day.isoformat(), "employees": 0, "generated": 0, "unchanged": 0, "failed": 0}
+
+    async with session_factory() as db:
+        query = select(User.id, User.username).where(User.role == "employee").order_by(User.id)
+        if employee_ids:
+            query = query.where(User.id.in_(employee_ids))
+        employees = (await db.execute(query)).all()
+        report["employees"] = len(employees)
+
+        team_counts = await db.run_sync(fetch_summary_counts, [user_id for user_id, _ in employees])
+        content_hashes = {
+            user_id: summary_cache_key(team_counts[user_id], username, LLM_MODEL, PROMPT_VERSION)
+            for user_id, username in employees
+        }
+        existing = {
+            row.user_id: row for row in await db.scalars(select(DailySummary).where(
+                DailySummary.user_id.in_(content_hashes),
+                DailySummary.summary_date == day
+            ))
+        }
+
+        stale = [
+            (user_id, username) for user_id, username in employees
+            if force or user_id not in existing or existing[user_id].content_hash != content_hashes[user_id]
+        ]
+        report["unchanged"] = len(employees) - len(stale)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate(user_id: int, username: str):
+            async with semaphore:
+                try:
+                    return user_id, await call_llm(create_summary_prompt(team_counts[user_id], username))
+                except LLMError as e:
+                    logger.warning(f"Summary for employee {user_id} failed: {str(e)}")
+                    return user_id, None
+
+        pending = [asyncio.create_task(generate(user_id, username)) for user_id, username in stale]
+        try:
+            # Results are written one at a time as they arrive; the session is never shared between tasks
+            for next_done in asyncio.as_completed(pending):
+                user_id, summary = await next_done
+                if summary is None or "raw" in summary:
+                    report["failed"] += 1
+                    continue
+
+                # Another run may have stored this row since `existing` was read
+                await db.execute(upsert_daily_summary(
+                    db.bind.dialect.name, user_id=user_id, summary_date=day, content_hash=content_hashes[user_id],
+                    summary=summary, generated_at=datetime.utcnow()
+                ))
+                await db.commit()
+                summary_cache.set(content_hashes[user_id], summary)
+                report["generated"] += 1
+        finally:
+            for task in pending:
+                task.cancel()
+
+    report["duration_seconds"] = time.monotonic() - started
+    return report
+
+
+class SummaryScheduler:
+    """
+    Runs `run_summary_pipeline` on a fixed interval as a task on the API's
+    event loop (so it shares the LLM client). Each run only calls the LLM for
+    employees whose tasks changed, so frequent runs stay cheap.
+    """
+
+    def __init__(self, interval: float = SUMMARY_PIPELINE_INTERVAL_SECONDS, pipeline=run_summary_pipeline):
+        self.interval = interval
+        self._pipeline = pipeline
+        self._task = None
+        self._running = asyncio.Lock()
+        self.last_report = None
+
+    def start(self):
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._loop())
+        logger.info(f"Summary pipeline scheduled, interval {self.interval:.0f}s")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Summary pipeline stopped")
+
+    async def run_once(self):
+        """Run the pipeline now. Returns its report, or None if a run is already in progress or failed."""
+        if self._running.locked():
+            logger.warning("Summary pipeline still running, skipping this run")
+            return None
+        async with self._running:
+            try:
+                report = await self._pipeline()
+            except Exception as e:
+                logger.error(f"Summary pipeline failed: {str(e)}")
+                return None
+            self.last_report = report
+            logger.info(f"Summary pipeline took {report['duration_seconds']:.1f}s: {report['generated']} generated, "
+                        f"{report['unchanged']} unchanged, {report['failed']} failed")
+            return report
+
+    async def _loop(self):
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval)
+
+
+# Shared, process-wide scheduler
+summary_scheduler = SummaryScheduler()
+
+
+async def main(employee_ids: list, force: bool, concurrency: int):
+    from database import async_engine
+    from ai_agents.llm_client import llm_client
+
+    try:
+        return await run_summary_pipeline(employee_ids, force=force, concurrency=concurrency)
+    finally:
+        await llm_client.aclose()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employee-id", type=int, action="append", dest="employee_ids",
+                        help="only this employee (repeatable); default all employees")
+    parser.add_argument("--force", action="store_true", help="regenerate even if the tasks are unchanged")
+    parser.add_argument("--concurrency", type=int, default=SUMMARY_PIPELINE_CONCURRENCY)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(json.dumps(asyncio.run(main(args.employee_ids, args.force, args.concurrency)), indent=2))
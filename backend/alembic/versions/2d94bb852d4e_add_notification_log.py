@@ -0,0 +1,40 @@
+"""Add notification_log ledger
+
+Revision ID: 2d94bb852d4e
+Revises: 77edb33e72df
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d94bb852d4e'
+down_revision: Union[str, Sequence[str], None] = '77edb33e72df'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'notification_log',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('last_sent_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_notification_log_id'), 'notification_log', ['id'], unique=False)
+    op.create_index('ix_notification_log_task_id_kind', 'notification_log', ['task_id', 'kind'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notification_log_task_id_kind', table_name='notification_log')
+    op.drop_index(op.f('ix_notification_log_id'), table_name='notification_log')
+    op.drop_table('notification_log')
@@ -0,0 +1,30 @@
+"""Add summary and availability indexes
+
+Revision ID: 4c87b5cb0c5a
+Revises: 7072a3edbfc2
+Create Date: 2026-10-17 14:02:17.640385
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c87b5cb0c5a'
+down_revision: Union[str, Sequence[str], None] = '7072a3edbfc2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_assignee_id_status_updated_at', 'tasks', ['assignee_id', 'status_updated_at'], unique=False)
+    op.create_index('ix_employee_profiles_is_available', 'employee_profiles', ['is_available'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_employee_profiles_is_available', table_name='employee_profiles')
+    op.drop_index('ix_tasks_assignee_id_status_updated_at', table_name='tasks')
@@ -0,0 +1,34 @@
+"""Add task listing indexes
+
+Revision ID: 6aaeef8fe161
+Revises: 2d94bb852d4e
+Create Date: 2026-10-17 11:40:05.532917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6aaeef8fe161'
+down_revision: Union[str, Sequence[str], None] = '2d94bb852d4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_created_at_id', 'tasks', ['created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_assignee_id_created_at_id', 'tasks', ['assignee_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_status_created_at_id', 'tasks', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_due_date_status', 'tasks', ['due_date', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_due_date_status', table_name='tasks')
+    op.drop_index('ix_tasks_status_created_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_assignee_id_created_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_created_at_id', table_name='tasks')
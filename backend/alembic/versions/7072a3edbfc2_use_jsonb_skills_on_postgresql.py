@@ -0,0 +1,48 @@
+"""Use JSONB skill columns with GIN indexes on PostgreSQL
+
+Revision ID: 7072a3edbfc2
+Revises: 6aaeef8fe161
+Create Date: 2026-10-17 12:30:41.208114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7072a3edbfc2'
+down_revision: Union[str, Sequence[str], None] = '6aaeef8fe161'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, GIN index); SQLite keeps plain JSON columns and no index
+SKILL_COLUMNS = [
+    ('users', 'skills', None),
+    ('tasks', 'required_skills', 'ix_tasks_required_skills_gin'),
+    ('employee_profiles', 'skills', 'ix_employee_profiles_skills_gin'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    for table, column, index in SKILL_COLUMNS:
+        op.alter_column(table, column, type_=postgresql.JSONB(), existing_type=sa.JSON(),
+                        postgresql_using=f'{column}::jsonb')
+        if index:
+            op.create_index(index, table, [column], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    for table, column, index in reversed(SKILL_COLUMNS):
+        if index:
+            op.drop_index(index, table_name=table)
+        op.alter_column(table, column, type_=sa.JSON(), existing_type=postgresql.JSONB(),
+                        postgresql_using=f'{column}::json')
@@ -0,0 +1,42 @@
+"""Add daily_summaries table
+
+Revision ID: 9b1e5d3f20a7
+Revises: 4c87b5cb0c5a
+Create Date: 2026-10-17 16:48:05.271930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b1e5d3f20a7'
+down_revision: Union[str, Sequence[str], None] = '4c87b5cb0c5a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'daily_summaries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('summary_date', sa.Date(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('summary', sa.JSON(), nullable=False),
+        sa.Column('generated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_daily_summaries_id'), 'daily_summaries', ['id'], unique=False)
+    op.create_index('ix_daily_summaries_user_id_summary_date', 'daily_summaries', ['user_id', 'summary_date'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_daily_summaries_user_id_summary_date', table_name='daily_summaries')
+    op.drop_index(op.f('ix_daily_summaries_id'), table_name='daily_summaries')
+    op.drop_table('daily_summaries')
@@ -0,0 +1,30 @@
+"""Lowercase task required_skills (no-op)
+
+Revision ID: c3f8a1d6e924
+Revises: 9b1e5d3f20a7
+Create Date: 2026-10-18 10:21:43.508117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a1d6e924'
+down_revision: Union[str, Sequence[str], None] = '9b1e5d3f20a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Skills keep their original casing; the ?skill= filter compares case-insensitively instead.
+    # Kept as an empty revision so databases already stamped with it still upgrade.
+    pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    pass
@@ -0,0 +1,34 @@
+"""Add scheduler_leases table
+
+Revision ID: e5b71c2d9f04
+Revises: c3f8a1d6e924
+Create Date: 2026-10-18 14:02:17.640385
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b71c2d9f04'
+down_revision: Union[str, Sequence[str], None] = 'c3f8a1d6e924'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'scheduler_leases',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('holder', sa.String(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('scheduler_leases')
@@ -1,33 +1,80 @@
+import os
+from dataclasses import dataclass
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
 from auth import decode_token
-from database import Session_local
+from cache import TTLCache
+from database import get_db
 from models import User
 
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 10000))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", 300))
+
 security = HTTPBearer()
 
-def get_db():
-    db = Session_local()
-    try:
-        yield db
-    finally:
-        db.close()
 
-def get_current_user(
+@dataclass(frozen=True)
+class CurrentUser:
+    """
+    Identity of the authenticated caller, as cached per token subject.
+    Carries only what route handlers and role checks need, not a session-bound User.
+    """
+    id: int
+    email: str
+    role: str
+    username: str = None
+
+
+# Token subject (email) -> CurrentUser
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_cached_user(mapper, connection, target):
+    # Drop both the current and, if it just changed, the previous email
+    history = inspect(target).attrs.email.history
+    emails = {target.email, *history.deleted}
+    for email in emails:
+        user_cache.delete(email)
+    # Until the commit, other requests still read the old row and may cache it again: evict once more then
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("stale_user_emails", set()).update(emails)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def evict_stale_users(session):
+    for email in session.info.pop("stale_user_emails", ()):
+        user_cache.delete(email)
+
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_db)
+) -> CurrentUser:
     token = credentials.credentials
     try:
         payload = decode_token(token)
         email = payload.get("sub")
         if not email:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-        
-        user = db.query(User).filter(User.email == email).first()
+
+        current_user = user_cache.get(email)
+        if current_user:
+            return current_user
+
+        user = (await db.execute(
+            select(User.id, User.email, User.role, User.username).where(User.email == email)
+        )).first()
         if not user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        return user
+        current_user = CurrentUser(id=user.id, email=user.email, role=user.role, username=user.username)
+        user_cache.set(email, current_user)
+        return current_user
     except Exception:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token verification failed") 
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token verification failed") 
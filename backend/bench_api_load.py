@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Load test a running API: N concurrent clients issue authenticated GETs
+against the given paths and report requests/sec and latency percentiles.
+Run it against two builds (e.g. sync vs async handlers) to compare them.
+
+Usage:
+    uvicorn main:app --port 8000 &
+    python bench_api_load.py --url http://127.0.0.1:8000 --email manager@x.com --password secret1 \\
+                             [--path /tasks/?limit=50 --path /tasks/export] [--concurrency 64] [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> dict:
+    response = await client.post("/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run_load(url: str, paths: list, headers: dict, concurrency: int, total: int):
+    latencies = []
+    errors = 0
+    issued = 0
+
+    async def client_loop(client):
+        nonlocal errors, issued
+        while issued < total:
+            path = paths[issued % len(paths)]
+            issued += 1
+            start = time.perf_counter()
+            try:
+                response = await client.get(path, headers=headers)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+        "max_ms": latencies[-1],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--path", action="append", dest="paths")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    paths = args.paths or ["/tasks/?limit=50"]
+
+    async with httpx.AsyncClient(base_url=args.url) as client:
+        headers = await login(client, args.email, args.password)
+    # Warm up connections, caches and the skill index
+    await run_load(args.url, paths, headers, args.concurrency, args.concurrency * 2)
+
+    result = await run_load(args.url, paths, headers, args.concurrency, args.requests)
+    print(f"{result['requests']} requests, {result['errors']} errors, concurrency {args.concurrency}")
+    print(f"{result['rps']:.0f} req/s   p50 {result['p50_ms']:.1f} ms   p99 {result['p99_ms']:.1f} ms   "
+          f"max {result['max_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch task-to-employee assignment: greedy (best remaining employee
+per task) vs the maximum-weight assignment solver, from 100x100 up to 1k x 1k.
+
+Usage:
+    python bench_assignment_solver.py [--sizes 100 250 500 1000]
+"""
+
+import argparse
+import random
+import time
+
+from ai_agents.skill_matrix import SkillMatrix
+from ai_agents import assignment_solver
+from ai_agents.assignment_solver import assign_tasks
+
+VOCABULARY = [f"skill_{i}" for i in range(150)]
+
+
+def greedy_plan(matrix: SkillMatrix, skills_per_task):
+    """The "fewest candidates first, best remaining employee" plan."""
+    rankings = [matrix.rank(skills) for skills in skills_per_task]
+    plan = [None] * len(skills_per_task)
+    taken = set()
+    for i in sorted(range(len(rankings)), key=lambda i: (len(rankings[i]), i)):
+        for candidate in rankings[i]:
+            if candidate[0] not in taken:
+                taken.add(candidate[0])
+                plan[i] = candidate
+                break
+    return plan
+
+
+def summarize(plan):
+    assigned = [p for p in plan if p]
+    return len(assigned), sum(p[1] for p in assigned)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 250, 500, 1000])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    backend = "scipy" if assignment_solver.linear_sum_assignment is not None else "numpy"
+    print(f"Solver backend: {backend}")
+    print(f"{'tasks x employees':>18} {'greedy ms':>10} {'greedy assigned/score':>22} "
+          f"{'solver ms':>10} {'solver assigned/score':>22}")
+
+    rng = random.Random(args.seed)
+    for n in args.sizes:
+        matrix = SkillMatrix()
+        matrix.load((i, i, rng.sample(VOCABULARY, rng.randint(2, 8))) for i in range(1, n + 1))
+        tasks = [rng.sample(VOCABULARY, rng.randint(1, 4)) for _ in range(n)]
+
+        start = time.perf_counter()
+        greedy = greedy_plan(matrix, tasks)
+        greedy_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        optimal = assign_tasks(matrix, tasks, max_cells=None)
+        solver_ms = (time.perf_counter() - start) * 1000
+
+        g_assigned, g_score = summarize(greedy)
+        o_assigned, o_score = summarize(optimal)
+        assert o_score >= g_score, "solver produced a worse assignment than greedy"
+
+        print(f"{f'{n} x {n}':>18} {greedy_ms:>10.1f} {f'{g_assigned}/{g_score}':>22} "
+              f"{solver_ms:>10.1f} {f'{o_assigned}/{o_score}':>22}")
+
+
+if __name__ == "__main__":
+    main()
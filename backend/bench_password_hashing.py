@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark password verify latency per hashing cost, to pick PASSWORD_<SCHEME>_ROUNDS
+for this hardware. Reports the highest cost whose median verify time stays
+under the target.
+
+Usage:
+    python bench_password_hashing.py [--scheme bcrypt] [--rounds 10 11 12 13 14]
+                                     [--iterations 5] [--target-ms 50]
+"""
+
+import argparse
+import statistics
+import time
+
+from utils import build_pwd_context
+
+
+def verify_latency_ms(context, iterations: int):
+    hashed = context.hash("benchmark-password")
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        context.verify("benchmark-password", hashed)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scheme", default="bcrypt")
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13, 14])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    print(f"{'rounds':>8} {'median ms':>10} {'max ms':>10}")
+    best = None
+    for rounds in sorted(args.rounds):
+        context = build_pwd_context([args.scheme], {args.scheme: (rounds, rounds, rounds)})
+        median, worst = verify_latency_ms(context, args.iterations)
+        print(f"{rounds:>8} {median:>10.1f} {worst:>10.1f}")
+        if median <= args.target_ms:
+            best = rounds
+
+    if best is None:
+        print(f"\nNo tested cost verifies within {args.target_ms:.0f} ms")
+    else:
+        print(f"\nHighest cost within {args.target_ms:.0f} ms: "
+              f"PASSWORD_SCHEMES={args.scheme} PASSWORD_{args.scheme.upper()}_ROUNDS={best}")
+
+
+if __name__ == "__main__":
+    main()
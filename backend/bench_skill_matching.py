@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark skill-match scoring: the original per-profile Python loop vs the
+inverted skill index vs the vectorized NumPy skill matrix.
+
+Usage:
+    python bench_skill_matching.py [--sizes 1000 10000 100000] [--queries 50]
+"""
+
+import argparse
+import random
+import time
+
+from ai_agents.assignment_agent import normalize_skills
+from ai_agents.skill_index import SkillIndex
+from ai_agents.skill_matrix import SkillMatrix
+
+VOCABULARY = [f"skill_{i}" for i in range(300)]
+
+
+def make_profiles(n: int, rng: random.Random):
+    """Fake `(profile_id, user_id, raw_skills)` rows with mixed-case skill names."""
+    return [
+        (i, i, [s.upper() if rng.random() < 0.3 else s for s in rng.sample(VOCABULARY, rng.randint(2, 10))])
+        for i in range(1, n + 1)
+    ]
+
+
+def python_loop_rank(profiles, required_skills_lower):
+    """The scoring loop `match_employees_by_skills` ran over every available profile."""
+    matched = []
+    for profile_id, _user_id, skills in profiles:
+        user_skills = normalize_skills(skills)
+        matching_skills = set(required_skills_lower) & set(user_skills)
+        match_score = len(matching_skills)
+        match_percentage = (match_score / len(required_skills_lower)) * 100
+        if match_score > 0:
+            matched.append((profile_id, match_score, match_percentage))
+    matched.sort(key=lambda x: (-x[1], -x[2], x[0]))
+    return matched
+
+
+def index_rank(index: SkillIndex, required_skills_lower):
+    ranked = [
+        (profile_id, len(matching), len(matching) / len(required_skills_lower) * 100)
+        for profile_id, matching in index.candidates(required_skills_lower).items()
+    ]
+    ranked.sort(key=lambda x: (-x[1], -x[2], x[0]))
+    return ranked
+
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    results = [fn(q) for q in queries]
+    return (time.perf_counter() - start) / len(queries) * 1000, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'employees':>10} {'python loop ms':>15} {'index ms':>10} {'numpy ms':>10} {'speedup':>8}")
+
+    for n in args.sizes:
+        profiles = make_profiles(n, rng)
+        normalized = [(pid, uid, normalize_skills(skills)) for pid, uid, skills in profiles]
+        queries = [[s.lower() for s in rng.sample(VOCABULARY, rng.randint(1, 5))] for _ in range(args.queries)]
+
+        index = SkillIndex()
+        index.load(normalized)
+        matrix = SkillMatrix()
+        matrix.load(normalized)
+
+        loop_ms, expected = timed(lambda q: python_loop_rank(profiles, q), queries)
+        index_ms, index_results = timed(lambda q: index_rank(index, q), queries)
+        numpy_ms, numpy_results = timed(matrix.rank, queries)
+
+        assert index_results == expected, "index ranking differs from the Python loop"
+        assert all(
+            [(pid, score) for pid, score, _ in got] == [(pid, score) for pid, score, _ in want]
+            for got, want in zip(numpy_results, expected)
+        ), "numpy ranking differs from the Python loop"
+
+        print(f"{n:>10} {loop_ms:>15.2f} {index_ms:>10.2f} {numpy_ms:>10.2f} {loop_ms / numpy_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
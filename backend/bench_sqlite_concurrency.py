@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent write throughput on a SQLite file per DB_PROFILE: several
+threads each commit small transactions shaped like /tasks/auto-assign (insert
+a task, flip an employee's availability) while readers list tasks.
+
+Usage:
+    python bench_sqlite_concurrency.py [--profiles default production]
+                                       [--writers 8] [--readers 4] [--writes 200]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, apply_sqlite_profile
+from models import User, Task, EmployeeProfile
+
+
+def make_session_factory(path: str, profile: str):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    apply_sqlite_profile(engine, profile)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    db = Session()
+    for i in range(50):
+        user = User(username=f"user{i}", email=f"user{i}@test.com", role="employee")
+        db.add(user)
+        db.flush()
+        db.add(EmployeeProfile(user_id=user.id, skills=["python"]))
+    db.commit()
+    db.close()
+    return engine, Session
+
+
+def writer(Session, writes: int, worker: int, counters: dict, lock: threading.Lock):
+    for i in range(writes):
+        db = Session()
+        try:
+            profile_id = (worker * writes + i) % 50 + 1
+            db.add(Task(title=f"task {worker}-{i}", status="pending", assignee_id=profile_id, required_skills=["python"]))
+            db.execute(update(EmployeeProfile).where(EmployeeProfile.id == profile_id)
+                       .values(is_available=i % 2 == 0))
+            db.commit()
+            key = "committed"
+        except OperationalError:
+            db.rollback()
+            key = "locked"
+        finally:
+            db.close()
+        with lock:
+            counters[key] += 1
+
+
+def reader(Session, stop: threading.Event, counters: dict, lock: threading.Lock):
+    while not stop.is_set():
+        db = Session()
+        try:
+            db.query(Task).order_by(Task.id.desc()).limit(100).all()
+            key = "reads"
+        except OperationalError:
+            key = "read_errors"
+        finally:
+            db.close()
+        with lock:
+            counters[key] += 1
+
+
+def run(profile: str, writers: int, readers: int, writes: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, Session = make_session_factory(os.path.join(tmp, "bench.db"), profile)
+        counters = {"committed": 0, "locked": 0, "reads": 0, "read_errors": 0}
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        reader_threads = [threading.Thread(target=reader, args=(Session, stop, counters, lock)) for _ in range(readers)]
+        writer_threads = [threading.Thread(target=writer, args=(Session, writes, w, counters, lock)) for w in range(writers)]
+        for thread in reader_threads:
+            thread.start()
+        start = time.perf_counter()
+        for thread in writer_threads:
+            thread.start()
+        for thread in writer_threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        for thread in reader_threads:
+            thread.join()
+        engine.dispose()
+
+    return counters, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", nargs="+", default=["default", "production"])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writes", type=int, default=200, help="transactions per writer")
+    args = parser.parse_args()
+
+    print(f"{'profile':>12} {'commits/s':>10} {'committed':>10} {'locked':>8} {'reads/s':>9} {'read errs':>10}")
+    for profile in args.profiles:
+        counters, elapsed = run(profile, args.writers, args.readers, args.writes)
+        print(f"{profile:>12} {counters['committed'] / elapsed:>10.0f} {counters['committed']:>10} "
+              f"{counters['locked']:>8} {counters['reads'] / elapsed:>9.0f} {counters['read_errors']:>10}")
+
+
+if __name__ == "__main__":
+    main()
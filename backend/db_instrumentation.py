@@ -0,0 +1,74 @@
+# db_instrumentation.py
+"""
+Per-request database accounting: how many statements a request issued and
+how long they took, surfaced as X-DB-Query-Count / X-DB-Time-Ms response
+headers and aggregated for /metrics.
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+from starlette.middleware.base import BaseHTTPMiddleware
+
+
+class RequestDBStats:
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+# Set for the duration of an HTTP request; None for background work (sweeps, email queue)
+request_db_stats: ContextVar = ContextVar("request_db_stats", default=None)
+
+_totals_lock = threading.Lock()
+_totals = {"requests": 0, "queries_total": 0, "queries_per_request_max": 0, "db_seconds_total": 0.0}
+
+
+def instrument_engine(engine):
+    """
+    Time every statement `engine` executes and charge it to the current request.
+    Pass `AsyncEngine.sync_engine` for async engines.
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        stats = request_db_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.seconds += elapsed
+
+
+class DBStatsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        stats = RequestDBStats()
+        token = request_db_stats.set(stats)
+        try:
+            response = await call_next(request)
+        finally:
+            request_db_stats.reset(token)
+
+        # Streamed bodies are still running here; their later queries are not included
+        response.headers["X-DB-Query-Count"] = str(stats.queries)
+        response.headers["X-DB-Time-Ms"] = f"{stats.seconds * 1000:.1f}"
+        with _totals_lock:
+            _totals["requests"] += 1
+            _totals["queries_total"] += stats.queries
+            _totals["queries_per_request_max"] = max(_totals["queries_per_request_max"], stats.queries)
+            _totals["db_seconds_total"] += stats.seconds
+        return response
+
+
+def db_request_stats() -> dict:
+    with _totals_lock:
+        stats = dict(_totals)
+    requests = stats["requests"]
+    stats["queries_per_request_avg"] = stats["queries_total"] / requests if requests else 0.0
+    stats["db_ms_per_request_avg"] = stats["db_seconds_total"] * 1000 / requests if requests else 0.0
+    return stats
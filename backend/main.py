@@ -1,11 +1,37 @@
-
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from database import engine, Base
 import models
-from routes import auth_routes, task_routes , summary
+from routes import auth_routes, task_routes , summary, metrics, dashboard
 from fastapi.middleware.cors import CORSMiddleware
+from db_instrumentation import DBStatsMiddleware
+from utils import password_pool
+from ai_agents.email_queue import email_queue
+from ai_agents.notification_agent import smtp_pool
+from ai_agents.notification_scheduler import notification_scheduler, NOTIFICATION_SCHEDULER_ENABLED
+from ai_agents.summary_cache import summary_cache
+from ai_agents.summary_pipeline import summary_scheduler, SUMMARY_PIPELINE_ENABLED
+from ai_agents.llm_client import llm_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    email_queue.start()
+    if NOTIFICATION_SCHEDULER_ENABLED:
+        notification_scheduler.start()
+    if SUMMARY_PIPELINE_ENABLED:
+        summary_scheduler.start()
+    yield
+    await summary_scheduler.stop()
+    notification_scheduler.stop()
+    email_queue.stop()
+    smtp_pool.close()
+    password_pool.shutdown()
+    summary_cache.close()
+    await llm_client.aclose()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 
 
 
@@ -16,7 +42,11 @@ Base.metadata.create_all(bind=engine)
 app.include_router(auth_routes.router, prefix="")
 app.include_router(task_routes.router, prefix="")
 app.include_router(summary.router, prefix="")
+app.include_router(metrics.router, prefix="")
+app.include_router(dashboard.router, prefix="")
+
 
+app.add_middleware(DBStatsMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,4 +54,6 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all HTTP methods including OPTIONS
     allow_headers=["*"],  # Allows all headers
+    # Pagination cursor, per-request DB stats, summary cache outcome
+    expose_headers=["X-Next-Cursor", "X-DB-Query-Count", "X-DB-Time-Ms", "X-Summary-Cache"],
 )
@@ -6,6 +6,7 @@ Run this script to interactively test your AI agents
 
 import os
 import sys
+import asyncio
 from sqlalchemy.orm import Session
 from database import Session_local
 from models import User, Task, EmployeeProfile
@@ -265,7 +266,7 @@ def test_llm_client():
         print(f"Prompt: {prompt}")
         
         try:
-            summary = get_summary_from_llm(prompt)
+            summary = asyncio.run(get_summary_from_llm(prompt))
             print(f"Summary: {summary}")
         except Exception as e:
             print(f"Error: {e}")
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, JSON,DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, JSON,DateTime, Date, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
 
+# JSON everywhere; JSONB on PostgreSQL so skill lists can be GIN-indexed and queried with @>
+JSONList = JSON().with_variant(JSONB(), "postgresql")
+
 
 class User(Base):
     __tablename__ = 'users'
@@ -12,7 +16,7 @@ class User(Base):
     email = Column(String, unique=True, index=True)
     role = Column(String)
     hashed_password = Column(String)
-    skills = Column(JSON, nullable=True, default=[]) # ✅ List of strings, e.g., ["Python", "Django"]
+    skills = Column(JSONList, nullable=True, default=[]) # ✅ List of strings, e.g., ["Python", "Django"]
     availability = Column(Boolean, default=True)
     
     tasks = relationship("Task", back_populates="assignee")
@@ -26,13 +30,27 @@ class Task(Base):
     title = Column(String)
     description = Column(String)
     assignee_id = Column(Integer, ForeignKey(User.id)) 
-    required_skills = Column(JSON, nullable=True, default=[])  # ✅ Also list of strings
+    required_skills = Column(JSONList, nullable=True, default=[])  # ✅ Also list of strings
     status = Column(String)  # "pending", "completed", etc.
     created_at = Column(DateTime, default=datetime.utcnow)
     status_updated_at = Column(DateTime, default=datetime.utcnow)
     due_date = Column(DateTime, nullable=True)
     
     assignee = relationship("User", back_populates="tasks")
+    notifications = relationship("NotificationLog", back_populates="task", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Keyset pagination of task listings on (created_at, id), optionally filtered
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_assignee_id_created_at_id", "assignee_id", "created_at", "id"),
+        # Daily summary: assignee_id = ? AND (created_at >= ? OR status_updated_at >= ?), one index per OR branch
+        Index("ix_tasks_assignee_id_status_updated_at", "assignee_id", "status_updated_at"),
+        Index("ix_tasks_status_created_at_id", "status", "created_at", "id"),
+        # Due-date range filters and the due-soon/overdue sweeps
+        Index("ix_tasks_due_date_status", "due_date", "status"),
+        # Skill containment (required_skills @> '["python"]') on PostgreSQL
+        Index("ix_tasks_required_skills_gin", "required_skills", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
 
 
 class EmployeeProfile(Base):
@@ -41,6 +59,53 @@ class EmployeeProfile(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), unique=True)
     is_available = Column(Boolean, default=True)  # ❌ Removed redundant 'skills'
-    skills = Column(JSON, nullable=True, default=[])
+    skills = Column(JSONList, nullable=True, default=[])
 
     user = relationship("User", back_populates="employee_profile")
+
+    __table_args__ = (
+        # Auto-assignment only considers available employees
+        Index("ix_employee_profiles_is_available", "is_available"),
+        Index("ix_employee_profiles_skills_gin", "skills", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
+
+class NotificationLog(Base):
+    __tablename__ = "notification_log"
+
+    id = Column(Integer, primary_key=True, index=True)
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String, nullable=False)  # "due_soon", "overdue"
+    last_sent_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    task = relationship("Task", back_populates="notifications")
+
+    __table_args__ = (
+        # One row per (task, kind); also serves the sweeps' anti-join lookups
+        Index("ix_notification_log_task_id_kind", "task_id", "kind", unique=True),
+    )
+
+
+class DailySummary(Base):
+    __tablename__ = "daily_summaries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    summary_date = Column(Date, nullable=False)
+    content_hash = Column(String(64), nullable=False)  # summary_cache_key of the task data it was built from
+    summary = Column(JSON, nullable=False)
+    generated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # One materialized summary per employee per day; also the route's lookup
+        Index("ix_daily_summaries_user_id_summary_date", "user_id", "summary_date", unique=True),
+    )
+
+
+class SchedulerLease(Base):
+    __tablename__ = "scheduler_leases"
+
+    # One row per periodic job, e.g. "notification_sweep"
+    name = Column(String, primary_key=True)
+    holder = Column(String, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
@@ -0,0 +1,55 @@
+# pagination.py
+"""
+Keyset (cursor) pagination on `(created_at, id)`, newest first.
+
+Instead of OFFSET, each page continues strictly after the last row of the
+previous one, so the cost of a page does not grow with its depth.
+"""
+
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat() if created_at else None, row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_statement(stmt, model, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    """
+    Restrict `stmt` to one page ordered by `(model.created_at, model.id)`
+    descending. One extra row is fetched so `split_page` can tell whether
+    another page follows.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.filter(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    return stmt.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def split_page(rows: list, limit: int = DEFAULT_PAGE_SIZE):
+    """
+    Return `(rows, next_cursor)` for rows fetched with `keyset_statement`.
+    `next_cursor` is None on the last page.
+    """
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
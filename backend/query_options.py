@@ -0,0 +1,44 @@
+# query_options.py
+"""
+Shared loader options so call sites that touch relationships load them up
+front instead of issuing one lazy SELECT per row (N+1), and query clauses
+that differ per database backend or are shared by aggregate queries.
+"""
+
+from sqlalchemy import case, exists, func, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import joinedload
+from database import engine
+from models import Task, EmployeeProfile
+
+
+def task_with_assignee():
+    """Load `Task.assignee` in the same statement (many-to-one, JOIN)."""
+    return joinedload(Task.assignee)
+
+
+def profile_with_user():
+    """Load `EmployeeProfile.user` in the same statement (one-to-one, JOIN)."""
+    return joinedload(EmployeeProfile.user)
+
+
+def json_list_contains(column, value, dialect: str = None):
+    """
+    Filter clause: the JSON list in `column` has an entry equal to `value`,
+    ignoring case. Stored entries keep their original casing; the list is
+    scanned with jsonb_array_elements_text on PostgreSQL and json_each on
+    SQLite, whose built-in lower() only folds ASCII, so it uses the
+    `unicode_lower` function registered by `register_sqlite_functions`.
+    """
+    if (dialect or engine.dialect.name) == "postgresql":
+        entries = func.jsonb_array_elements_text(type_coerce(column, JSONB)).table_valued("value")
+        lower = func.lower
+    else:
+        entries = func.json_each(column).table_valued("value")
+        lower = func.unicode_lower
+    return exists(select(1).select_from(entries).where(lower(entries.c.value) == value.lower()))
+
+
+def count_where(condition):
+    """COUNT of rows matching `condition`, as a column of an aggregate SELECT (0 when no rows)."""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
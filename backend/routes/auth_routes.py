@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 
-from database import Session_local
+from database import get_db
 from schemas import UserCreate, UserLogin
 from models import User, EmployeeProfile
-from utils import hash_password, verify_password
+from utils import hash_password_async, verify_and_update_password_async, PasswordPoolFull
 from auth import create_access_token,decode_token
+from ai_agents.assignment_agent import index_employee_profile
 
 router = APIRouter()
 
@@ -18,30 +20,34 @@ ALGORITHM = "HS256"
 # HTTPBearer instead of OAuth2
 oauth2_scheme = HTTPBearer()
 
-# ✅ Dependency for DB session
-def get_db():
-    db = Session_local()
-    try:
-        yield db
-    finally:
-        db.close()
 
-# ✅ Register route
+PASSWORD_POOL_BUSY = HTTPException(
+    status_code=429, detail="Too many authentication requests, please retry shortly", headers={"Retry-After": "1"}
+)
+
+async def find_user_by_email(db: AsyncSession, email: str):
+    return await db.scalar(select(User).where(User.email == email))
+
+# ✅ Register route (bcrypt runs in the password pool)
 @router.post("/register")
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    if db.query(User).filter(User.email == user.email).first():
+async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
+    if await find_user_by_email(db, user.email):
         raise HTTPException(status_code=400, detail="Email already exists")
-    
+
+    try:
+        hashed_password = await hash_password_async(user.password)
+    except PasswordPoolFull:
+        raise PASSWORD_POOL_BUSY
+
     new_user = User(
         username=user.username,
         email=user.email,
         role=user.role,
-        hashed_password=hash_password(user.password),
+        hashed_password=hashed_password,
         skills=user.skills
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
 
     if user.role == "employee":
         if not user.skills:
@@ -51,16 +57,28 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
             skills=user.skills  # Keep as list for JSON field
         )
         db.add(profile)
-        db.commit()
+        await db.commit()
+        index_employee_profile(profile)
 
     return {"message": "User registered successfully"}
 
 # ✅ Login route (returns Bearer Token)
 @router.post("/login")
-def login(user: UserLogin, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+async def login(user: UserLogin, db: AsyncSession = Depends(get_db)):
+    db_user = await find_user_by_email(db, user.email)
+    if not db_user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    try:
+        valid, new_hash = await verify_and_update_password_async(user.password, db_user.hashed_password)
+    except PasswordPoolFull:
+        raise PASSWORD_POOL_BUSY
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    # Stored hash predates the current hashing policy: upgrade it now that we have the password
+    if new_hash:
+        db_user.hashed_password = new_hash
+        await db.commit()
+
     token = create_access_token(data={"sub": db_user.email, "role": db_user.role})
     return {"access_token": token, "token_type": "bearer"}
@@ -0,0 +1,55 @@
+import os
+from fastapi import APIRouter, Depends
+from sqlalchemy import func, select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db
+from models import Task, User
+from schemas import DashboardStats, TaskStats, UserStats, TaskSummary, TaskStatus, UserRole, TaskPriority
+from query_options import count_where
+from auth_utils import CurrentUser
+from dependencies.roles import require_manager
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+RECENT_TASKS_LIMIT = int(os.getenv("DASHBOARD_RECENT_TASKS_LIMIT", 10))
+
+
+# Each block is a single aggregate statement; no rows are loaded to count them
+TASK_STATS_QUERY = select(
+    func.count(Task.id).label("total_tasks"),
+    *(count_where(Task.status == s.value).label(f"{s.value}_tasks") for s in TaskStatus),
+    # NULL or non-canonical statuses (e.g. a legacy "Pending"), so the buckets add up to total_tasks
+    count_where(or_(Task.status.is_(None), Task.status.not_in([s.value for s in TaskStatus]))).label("other_tasks")
+)
+
+USER_STATS_QUERY = select(
+    func.count(User.id).label("total_users"),
+    # "Active" here means available for task assignment; there is no account-status column
+    count_where(User.availability.is_(True)).label("active_users"),
+    *(count_where(User.role == r.value).label(f"{r.value}s") for r in UserRole)
+)
+
+RECENT_TASKS_QUERY = select(
+    Task.id, Task.title, Task.status, Task.assignee_id, Task.due_date
+).order_by(Task.created_at.desc(), Task.id.desc()).limit(RECENT_TASKS_LIMIT)
+
+
+# ✅ Task and user counts plus the latest tasks, for the manager dashboard
+@router.get("/stats", response_model=DashboardStats)
+async def get_dashboard_stats(
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(require_manager)
+):
+    task_stats = (await db.execute(TASK_STATS_QUERY)).mappings().one()
+    user_stats = (await db.execute(USER_STATS_QUERY)).mappings().one()
+    recent_tasks = [
+        # Tasks have no priority column yet
+        TaskSummary(**row, priority=TaskPriority.MEDIUM.value)
+        for row in (await db.execute(RECENT_TASKS_QUERY)).mappings()
+    ]
+
+    return DashboardStats(
+        task_stats=TaskStats(**task_stats),
+        user_stats=UserStats(**user_stats),
+        recent_tasks=recent_tasks
+    )
@@ -0,0 +1,30 @@
+from fastapi import APIRouter
+
+from auth_utils import user_cache
+from database import async_engine
+from db_instrumentation import db_request_stats
+from utils import password_pool
+from ai_agents.email_queue import email_queue
+from ai_agents.notification_agent import smtp_pool
+from ai_agents.notification_scheduler import notification_scheduler
+from ai_agents.summary_cache import summary_cache
+from ai_agents.summary_pipeline import summary_scheduler
+from ai_agents.llm_client import llm_client
+
+router = APIRouter(tags=["Metrics"])
+
+
+# ✅ Operational counters for background components
+@router.get("/metrics")
+def get_metrics():
+    return {
+        "email_queue": email_queue.stats(),
+        "smtp_pool": smtp_pool.stats(),
+        "password_hashing": password_pool.stats(),
+        "user_cache": user_cache.stats(),
+        "database": {**db_request_stats(), "pool": async_engine.pool.status()},
+        "summary_cache": summary_cache.stats(),
+        "llm": llm_client.stats(),
+        "notification_sweep": notification_scheduler.last_report,
+        "summary_pipeline": summary_scheduler.last_report,
+    }
@@ -1,27 +1,140 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database import Session_local
+import os
+import json
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db
 from models import User
-from ai_agents.summary_agent import fetch_tasks_for_summary, create_summary_prompt, call_llm
+from auth_utils import CurrentUser
+from dependencies.roles import require_manager
+from ai_agents.summary_agent import (
+    fetch_summary_counts, create_summary_prompt, call_llm, LLM_MODEL, PROMPT_VERSION
+)
+from ai_agents.llm_client import LLMError
+from ai_agents.summary_cache import summary_cache, summary_cache_key
+from ai_agents.summary_pipeline import load_daily_summaries
+
+# Employees summarized at once by /summary/team (the LLM client also caps in-flight calls process-wide)
+TEAM_SUMMARY_CONCURRENCY = int(os.getenv("TEAM_SUMMARY_CONCURRENCY", 4))
 
 router = APIRouter()
 
 
-def get_db():
-    db = Session_local()
+async def summarize(counts: dict, employee_name: str, refresh: bool = False, semaphore: asyncio.Semaphore = None):
+    """
+    Return `(summary, cache_outcome)` for one employee: from the summary cache
+    unless `refresh`, otherwise from the LLM (inside `semaphore` when given).
+    Raises LLMError when the provider keeps failing.
+    """
+    cache_key = summary_cache_key(counts, employee_name, LLM_MODEL, PROMPT_VERSION)
+    if refresh:
+        summary_cache.record_refresh()
+    else:
+        summary = summary_cache.get(cache_key)
+        if summary is not None:
+            return summary, "hit"
+
+    prompt = create_summary_prompt(counts, employee_name)
+    if semaphore is not None:
+        async with semaphore:
+            summary = await call_llm(prompt)
+    else:
+        summary = await call_llm(prompt)
+
+    # Unparsed answers are not cached, so the next request asks again
+    if "raw" not in summary:
+        summary_cache.set(cache_key, summary)
+    return summary, "refresh" if refresh else "miss"
+
+
+async def stream_team_summaries(employees: list, team_counts: dict, materialized: dict, refresh: bool):
+    """
+    Yield one NDJSON line per employee: pre-computed summaries first, then the
+    rest in the order their summaries complete.
+    """
+    semaphore = asyncio.Semaphore(TEAM_SUMMARY_CONCURRENCY)
+
+    for user_id, username in employees:
+        if user_id in materialized:
+            yield json.dumps({"employee_id": user_id, "employee": username,
+                              "summary": materialized[user_id], "cache": "materialized"}) + "\n"
+
+    async def summarize_employee(user_id: int, username: str):
+        line = {"employee_id": user_id, "employee": username}
+        try:
+            line["summary"], line["cache"] = await summarize(team_counts[user_id], username, refresh, semaphore)
+        except LLMError:
+            line["error"] = "Summary provider unavailable, please retry later"
+        return line
+
+    pending = [
+        asyncio.create_task(summarize_employee(user_id, username))
+        for user_id, username in employees if user_id not in materialized
+    ]
     try:
-        yield db
+        for next_done in asyncio.as_completed(pending):
+            yield json.dumps(await next_done) + "\n"
     finally:
-        db.close()
+        # Client disconnected mid-stream: don't keep calling the LLM for nobody
+        for task in pending:
+            task.cancel()
 
+
+# ✅ Daily summaries for the whole team, streamed as NDJSON as each one completes
+@router.get("/summary/team")
+async def generate_team_summary(
+    employee_ids: Optional[list[int]] = Query(None),
+    refresh: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(require_manager)
+):
+    query = select(User.id, User.username).where(User.role == "employee").order_by(User.id)
+    if employee_ids:
+        query = query.where(User.id.in_(employee_ids))
+    employees = (await db.execute(query)).all()
+
+    # All DB work happens before streaming: the request session is closed once the body starts
+    team_counts = await db.run_sync(fetch_summary_counts, [user_id for user_id, _ in employees])
+    materialized = {}
+    if not refresh:
+        materialized = await load_daily_summaries(db, {
+            user_id: summary_cache_key(team_counts[user_id], username, LLM_MODEL, PROMPT_VERSION)
+            for user_id, username in employees
+        })
+
+    return StreamingResponse(
+        stream_team_summaries(employees, team_counts, materialized, refresh),
+        media_type="application/x-ndjson"
+    )
+
+
+# ✅ Daily summary; served pre-computed (or from the summary cache) while the employee's tasks are unchanged
 @router.get("/summary/{employee_id}")
-def generate_employee_summary(employee_id: int, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == employee_id).first()
+async def generate_employee_summary(
+    employee_id: int,
+    response: Response,
+    refresh: bool = False,
+    db: AsyncSession = Depends(get_db)
+):
+    user = await db.get(User, employee_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    task_data = fetch_tasks_for_summary(db, employee_id)
-    prompt = create_summary_prompt(task_data, user.username)
-    summary = call_llm(prompt)
+    counts = (await db.run_sync(fetch_summary_counts, [employee_id]))[employee_id]
+    if not refresh:
+        content_hash = summary_cache_key(counts, user.username, LLM_MODEL, PROMPT_VERSION)
+        materialized = await load_daily_summaries(db, {employee_id: content_hash})
+        if employee_id in materialized:
+            response.headers["X-Summary-Cache"] = "materialized"
+            return materialized[employee_id]
+
+    try:
+        summary, cache_outcome = await summarize(counts, user.username, refresh)
+    except LLMError:
+        raise HTTPException(status_code=502, detail="Summary provider unavailable, please retry later")
 
+    response.headers["X-Summary-Cache"] = cache_outcome
     return summary
@@ -1,28 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import Session_local
+from database import AsyncSession_local, Session_local, get_db
 from models import Task, User,EmployeeProfile
 from schemas import TaskCreate, TaskUpdate, TaskOut
-from auth_utils import get_current_user
+from query_options import task_with_assignee, json_list_contains
+from pagination import keyset_statement, split_page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from auth_utils import get_current_user, CurrentUser
 from dependencies.roles import require_admin, require_manager, require_employee
-from ai_agents.assignment_agent import auto_assign_agent
-from ai_agents.notification_agent import send_email
+from ai_agents.assignment_agent import auto_assign_agent, auto_assign_batch
+from ai_agents.email_queue import enqueue_email
 
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
-def get_db():
-    db = Session_local()
-    try:
-        yield db
-    finally:
-        db.close()
+# Rows fetched from the database cursor (and flushed to the client) per batch
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+# Assignment jobs running in worker threads at once; each holds one connection of the sync engine's pool
+ASSIGNMENT_CONCURRENCY = int(os.getenv("ASSIGNMENT_CONCURRENCY", 2))
+assignment_slots = asyncio.Semaphore(ASSIGNMENT_CONCURRENCY)
+
+
+async def load_task(db: AsyncSession, task_id: int):
+    """Fetch a task with its assignee loaded (TaskOut nests it; async sessions cannot lazy-load)."""
+    return await db.scalar(
+        select(Task).options(task_with_assignee()).where(Task.id == task_id)
+        .execution_options(populate_existing=True)
+    )
+
+def run_in_own_session(job, *args, **kwargs):
+    with Session_local() as db:
+        return job(db, *args, **kwargs)
+
+
+async def run_assignment_job(db: AsyncSession, job, *args, **kwargs):
+    """
+    Run a synchronous assignment job, `job(sync_db, *args, **kwargs)`, in a
+    worker thread on a sync session of its own, so matching never runs on the
+    event loop.
+
+    The job cannot share the request's AsyncSession from another thread.
+    Instead the request session ends its transaction first, which returns its
+    connection to the pool, so the request still holds at most one connection
+    at a time. At most ASSIGNMENT_CONCURRENCY jobs run at once, which bounds
+    the connections they take from the sync engine's pool.
+    """
+    await db.commit()
+    async with assignment_slots:
+        return await run_in_threadpool(run_in_own_session, job, *args, **kwargs)
 
 # ✅ Create a new task with auto-assignment
 @router.post("/auto-assign")
-def create_and_assign_task(task: TaskCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    result = auto_assign_agent(db, task.required_skills)
+async def create_and_assign_task(task: TaskCreate, db: AsyncSession = Depends(get_db), current_user=Depends(get_current_user)):
+    # Matching (and a skill index/matrix rebuild) is synchronous and CPU-bound; keep it off the event loop
+    result = await run_assignment_job(db, auto_assign_agent, task.required_skills)
 
     if not result['assigned_to']:
         raise HTTPException(status_code=404, detail="No suitable employee found")
@@ -35,9 +76,9 @@ def create_and_assign_task(task: TaskCreate, db: Session = Depends(get_db), curr
         required_skills=task.required_skills,
         assignee_id=result["assigned_to"]
     )
-    assignee = db.query(User).filter(User.id == result["assigned_to"]).first()
+    assignee = await db.get(User, result["assigned_to"])
     if assignee and assignee.email:
-        send_email(
+        enqueue_email(
             recipient=assignee.email,
             subject=f"[New Task Assigned] {new_task.title}",
            message=f"Hello {assignee.username},\n\nYou have been assigned a new task:\n\nTitle: {new_task.title}\nDescription: {new_task.description}\n\nBest,\nTaskBot"
@@ -45,8 +86,7 @@ def create_and_assign_task(task: TaskCreate, db: Session = Depends(get_db), curr
         
 
     db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
+    await db.commit()
 
     return {
         "message": "Task created and assigned successfully",
@@ -55,53 +95,204 @@ def create_and_assign_task(task: TaskCreate, db: Session = Depends(get_db), curr
         "skills_extracted": task.required_skills
     }
 
-# ✅ Get all tasks
+# ✅ Create and auto-assign many tasks in one transaction
+MAX_BATCH_SIZE = 1000
+
+
+@router.post("/auto-assign/batch")
+async def create_and_assign_tasks_batch(
+    tasks: list[TaskCreate],
+    tasks_per_employee: Optional[int] = Query(None, ge=1),   # default BATCH_ASSIGN_TASKS_PER_EMPLOYEE
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    if not tasks:
+        raise HTTPException(status_code=400, detail="No tasks provided")
+    if len(tasks) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SIZE} tasks per batch")
+
+    # Planning a large batch is CPU-bound; keep it off the event loop
+    results = await run_assignment_job(db, auto_assign_batch, tasks, capacities=tasks_per_employee)
+
+    assignee_ids = {r["assigned_to"] for r in results if r["success"]}
+    assignees = {
+        row.id: row
+        for row in await db.execute(select(User.id, User.username, User.email).where(User.id.in_(assignee_ids)))
+    } if assignee_ids else {}
+
+    for task, result in zip(tasks, results):
+        assignee = assignees.get(result["assigned_to"])
+        if assignee and assignee.email:
+            enqueue_email(
+                recipient=assignee.email,
+                subject=f"[New Task Assigned] {task.title}",
+                message=f"Hello {assignee.username},\n\nYou have been assigned a new task:\n\nTitle: {task.title}\nDescription: {task.description}\n\nBest,\nTaskBot"
+            )
+
+    assigned = sum(1 for r in results if r["success"])
+    return {
+        "message": f"{assigned} of {len(tasks)} tasks created and assigned",
+        "assigned": assigned,
+        "unassigned": len(tasks) - assigned,
+        "results": results
+    }
+
+def filter_tasks(query, status: str = None, assignee_id: int = None, due_after: datetime = None,
+                 due_before: datetime = None, skill: str = None):
+    """
+    Apply the optional server-side task list filters to a Task query.
+    `skill` matches an entry of `required_skills` case-insensitively.
+    """
+    if status:
+        query = query.filter(Task.status == status)
+    if assignee_id is not None:
+        query = query.filter(Task.assignee_id == assignee_id)
+    if due_after:
+        query = query.filter(Task.due_date >= due_after)
+    if due_before:
+        query = query.filter(Task.due_date < due_before)
+    if skill:
+        query = query.filter(json_list_contains(Task.required_skills, skill.strip()))
+    return query
+
+
+# ✅ Get all tasks (keyset-paginated, newest first; next page cursor in X-Next-Cursor)
 @router.get("/", response_model=list[TaskOut])
-def get_all_tasks(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_manager)
+async def get_all_tasks(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status: Optional[str] = None,
+    assignee_id: Optional[int] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    skill: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(require_manager)
 ):
-    return db.query(Task).all()
+    query = filter_tasks(select(Task).options(task_with_assignee()), status, assignee_id, due_after, due_before, skill)
+    tasks, next_cursor = split_page((await db.scalars(keyset_statement(query, Task, cursor, limit))).all(), limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return tasks
 
 
-# ✅ Get tasks assigned to the current user
+# ✅ Get tasks assigned to the current user (keyset-paginated like GET /tasks/)
 @router.get("/my", response_model=list[TaskOut])
-def get_my_tasks(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_employee)
+async def get_my_tasks(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status: Optional[str] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    skill: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(require_employee)
 ):
-    return db.query(Task).filter(Task.assignee_id == current_user.id).all()
+    query = filter_tasks(select(Task).options(task_with_assignee()), status, current_user.id, due_after, due_before, skill)
+    tasks, next_cursor = split_page((await db.scalars(keyset_statement(query, Task, cursor, limit))).all(), limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return tasks
+
+EXPORT_COLUMNS = [
+    Task.id, Task.title, Task.description, Task.status, Task.required_skills,
+    Task.assignee_id, User.username.label("assignee_username"), User.email.label("assignee_email"),
+    Task.created_at, Task.status_updated_at, Task.due_date,
+]
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+
+def export_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def stream_tasks_export(export_format: str, filters: dict):
+    """
+    Yield the filtered task table as NDJSON or CSV, one chunk per batch.
+
+    Plain column rows (no ORM objects) are read through a server-side cursor
+    in `EXPORT_BATCH_SIZE` batches, so memory stays flat however many tasks
+    there are. The generator owns its session: the request's `get_db` session
+    is already closed by the time the response body is streamed.
+    """
+    async with AsyncSession_local() as db:
+        query = filter_tasks(
+            select(*EXPORT_COLUMNS).outerjoin(User, Task.assignee_id == User.id), **filters
+        ).order_by(Task.id).execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_FIELDS)
+            yield buffer.getvalue()
+
+        result = await db.stream(query)
+        async for batch in result.partitions():
+            if export_format == "csv":
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(
+                    [export_value(v) if not isinstance(v, list) else ";".join(v) for v in row]
+                    for row in batch
+                )
+                yield buffer.getvalue()
+            else:
+                yield "".join(
+                    json.dumps({k: export_value(v) for k, v in zip(EXPORT_FIELDS, row)}) + "\n"
+                    for row in batch
+                )
+
+
+# ✅ Export all tasks as a streamed NDJSON or CSV download
+@router.get("/export")
+async def export_tasks(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    status: Optional[str] = None,
+    assignee_id: Optional[int] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    skill: Optional[str] = None,
+    current_user: CurrentUser = Depends(require_manager)
+):
+    filters = dict(status=status, assignee_id=assignee_id, due_after=due_after, due_before=due_before, skill=skill)
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream_tasks_export(format, filters),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'}
+    )
 
 # ✅ Update a task by ID
 @router.put("/{task_id}", response_model=TaskOut)
-def update_task(task_id: int, updated_task: TaskUpdate, db: Session = Depends(get_db)):
-    task = db.query(Task).filter(Task.id == task_id).first()
+async def update_task(task_id: int, updated_task: TaskUpdate, db: AsyncSession = Depends(get_db)):
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     task.title = updated_task.title
     task.description = updated_task.description
-    db.commit()
-    db.refresh(task)
-    return task
+    await db.commit()
+    return await load_task(db, task_id)
 
 # ✅ Delete a task
 @router.delete("/{task_id}")
-def delete_task(task_id: int, db: Session = Depends(get_db)):
-    task = db.query(Task).filter(Task.id == task_id).first()
+async def delete_task(task_id: int, db: AsyncSession = Depends(get_db)):
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    db.delete(task)
-    db.commit()
+    await db.delete(task)
+    await db.commit()
     return {"detail": "Task deleted"}
 
 @router.put("/{task_id}/assign", response_model=TaskOut)
-def assign_task(
+async def assign_task(
     task_id: int,
     task_data: TaskUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_manager)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(require_manager)
 ):
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
@@ -111,11 +302,10 @@ def assign_task(
         task.description = task_data.description
     if task_data.assignee_id:
         # Optional: Check if user exists
-        user = db.query(User).filter(User.id == task_data.assignee_id).first()
+        user = await db.get(User, task_data.assignee_id)
         if not user:
             raise HTTPException(status_code=404, detail="Assignee not found")
         task.assignee_id = task_data.assignee_id
 
-    db.commit()
-    db.refresh(task)
-    return task
+    await db.commit()
+    return await load_task(db, task_id)
@@ -139,7 +139,7 @@ class TaskOut(BaseModel):
 class TaskSummary(BaseModel):
     id: int
     title: str
-    status: str
+    status: Optional[str] = None
     priority: str
     assignee_id: Optional[int] = None
     due_date: Optional[datetime] = None
@@ -200,11 +200,12 @@ class TaskStats(BaseModel):
     in_progress_tasks: int
     completed_tasks: int
     cancelled_tasks: int
+    other_tasks: int = Field(0, description="Tasks with no status or one outside TaskStatus")
 
 
 class UserStats(BaseModel):
     total_users: int
-    active_users: int
+    active_users: int = Field(..., description="Users currently available for task assignment (User.availability)")
     admins: int
     managers: int
     employees: int
@@ -0,0 +1,148 @@
+"""
+Tests for the auto-assignment routes
+"""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, AsyncSession_local, get_db
+from models import User, Task, EmployeeProfile
+from auth_utils import get_current_user
+from routes import task_routes
+
+
+@pytest.fixture
+def app_db(monkeypatch):
+    """A TestClient for the task routes, a sync sessionmaker on the same database file, and both engines."""
+    app = FastAPI()
+    app.include_router(task_routes.router)
+    app.dependency_overrides[get_current_user] = lambda: None
+    monkeypatch.setattr(task_routes, "enqueue_email", lambda **kwargs: True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "test.db")
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        with Session() as db:
+            for i, skills in enumerate([["python", "sql"], ["python"], ["go"]]):
+                user = User(username=f"emp{i}", email=f"emp{i}@test.com", role="employee")
+                db.add(user)
+                db.flush()
+                db.add(EmployeeProfile(user_id=user.id, skills=skills))
+            db.commit()
+
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        monkeypatch.setattr(AsyncSession_local, "kw", {**AsyncSession_local.kw, "bind": async_engine})
+        monkeypatch.setattr(task_routes, "Session_local", Session)
+        try:
+            with TestClient(app) as client:
+                yield client, Session, (engine, async_engine.sync_engine)
+        finally:
+            asyncio.run(async_engine.dispose())
+            engine.dispose()
+
+
+def test_single_assignment_runs_off_the_event_loop(app_db, monkeypatch):
+    client, Session, _ = app_db
+    real_agent = task_routes.auto_assign_agent
+    loops = []
+
+    def agent(db, skills):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return real_agent(db, skills)
+
+    monkeypatch.setattr(task_routes, "auto_assign_agent", agent)
+    response = client.post("/tasks/auto-assign", json={"title": "API", "required_skills": ["Python", "SQL"]})
+
+    assert response.status_code == 200
+    assert loops == [None]
+    assert response.json()["assigned_to"] == 1
+    with Session() as db:
+        assert db.get(Task, response.json()["task_id"]).assignee_id == 1
+        assert db.get(EmployeeProfile, 1).is_available is False
+
+
+def test_assignment_routes_hold_one_connection_at_a_time(app_db):
+    client, Session, engines = app_db
+    checked_out, peak = [0], [0]
+
+    # Like get_current_user on a cache miss, read through the request session before assigning
+    async def current_user(db: AsyncSession = Depends(get_db)):
+        return (await db.execute(select(User.id))).first()
+
+    client.app.dependency_overrides[get_current_user] = current_user
+
+    def checkout(*args):
+        checked_out[0] += 1
+        peak[0] = max(peak[0], checked_out[0])
+
+    def checkin(*args):
+        checked_out[0] -= 1
+
+    for engine in engines:
+        event.listen(engine, "checkout", checkout)
+        event.listen(engine, "checkin", checkin)
+
+    batch = [{"title": f"task {i}", "required_skills": skills} for i, skills in enumerate([["python"], ["go"], ["rust"]])]
+    response = client.post("/tasks/auto-assign/batch", json=batch)
+    assert response.status_code == 200
+    assert [r["assigned_to"] for r in response.json()["results"]] == [1, 3, None]
+
+    response = client.post("/tasks/auto-assign", json={"title": "more", "required_skills": ["python"]})
+    assert response.json()["assigned_to"] == 2
+
+    # The worker-thread session only connects after the request session gave its connection back
+    assert peak[0] == 1
+
+
+def test_batch_assigns_every_task_in_one_transaction(app_db, monkeypatch):
+    client, Session, _ = app_db
+    emails = []
+    monkeypatch.setattr(task_routes, "enqueue_email", lambda **kwargs: emails.append(kwargs["recipient"]) or True)
+
+    batch = [
+        {"title": "api", "required_skills": ["python", "sql"]},
+        {"title": "cli", "required_skills": ["go"]},
+        {"title": "kernel", "required_skills": ["rust"]},
+        {"title": "script", "required_skills": ["python"]},
+    ]
+    response = client.post("/tasks/auto-assign/batch", json=batch)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["assigned"], body["unassigned"]) == (3, 1)
+    results = body["results"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert [r["assigned_to"] for r in results] == [1, 3, None, 2]
+    assert sorted(emails) == ["emp0@test.com", "emp1@test.com", "emp2@test.com"]
+    with Session() as db:
+        tasks = {task.id: task for task in db.query(Task)}
+        assert len(tasks) == 3
+        for result in results:
+            if result["success"]:
+                assert tasks[result["task_id"]].assignee_id == result["assigned_to"]
+        assert [p.is_available for p in db.query(EmployeeProfile).order_by(EmployeeProfile.id)] == [False, False, False]
+
+
+def test_batch_size_is_validated(app_db, monkeypatch):
+    client, Session, _ = app_db
+    monkeypatch.setattr(task_routes, "MAX_BATCH_SIZE", 2)
+
+    assert client.post("/tasks/auto-assign/batch", json=[]).status_code == 400
+    response = client.post("/tasks/auto-assign/batch", json=[{"title": f"t{i}", "required_skills": ["go"]} for i in range(3)])
+    assert response.status_code == 400
+    assert response.json()["detail"] == "At most 2 tasks per batch"
+    with Session() as db:
+        assert db.query(Task).count() == 0
@@ -0,0 +1,85 @@
+"""
+Tests for the maximum-weight batch assignment solver: the solver's total
+score matches a brute-force optimum on small problems, with and without SciPy
+"""
+
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from ai_agents import assignment_solver
+from ai_agents.assignment_solver import solve_max_weight_assignment, assign_tasks, AssignmentTooLarge
+from ai_agents.skill_matrix import SkillMatrix
+
+
+@pytest.fixture(params=["scipy", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "scipy":
+        pytest.importorskip("scipy.optimize")
+    else:
+        monkeypatch.setattr(assignment_solver, "linear_sum_assignment", None)
+    return request.param
+
+
+def brute_force_best(scores, capacities):
+    """Highest total score over every assignment of tasks to employees (or to nobody)."""
+    tasks, employees = scores.shape
+    best = 0
+    for choice in itertools.product(range(-1, employees), repeat=tasks):
+        load = np.bincount([e for e in choice if e >= 0], minlength=employees)
+        if (load <= capacities).all():
+            best = max(best, sum(scores[t, e] for t, e in enumerate(choice) if e >= 0))
+    return best
+
+
+def check_plan(pairs, scores, capacities):
+    tasks = [t for t, _ in pairs]
+    assert len(tasks) == len(set(tasks))
+    load = np.bincount([e for _, e in pairs], minlength=scores.shape[1])
+    assert (load <= capacities).all()
+    assert all(scores[t, e] > 0 for t, e in pairs)
+    return sum(int(scores[t, e]) for t, e in pairs)
+
+
+@pytest.mark.parametrize("shape", [(3, 3), (4, 2), (2, 5), (5, 4)])
+def test_solver_total_matches_brute_force(backend, shape):
+    rng = random.Random(sum(shape))
+    for _ in range(20):
+        scores = np.array([[rng.randint(0, 4) for _ in range(shape[1])] for _ in range(shape[0])])
+        capacities = np.array([rng.randint(1, 2) for _ in range(shape[1])])
+        pairs = solve_max_weight_assignment(scores, capacities)
+        assert check_plan(pairs, scores, capacities) == brute_force_best(scores, capacities)
+
+
+def test_solver_beats_greedy_where_greedy_is_suboptimal(backend):
+    # Greedy gives task 0 its best employee (0) and leaves task 1 with nobody
+    scores = np.array([[3, 2],
+                       [3, 0]])
+    assert sorted(solve_max_weight_assignment(scores)) == [(0, 1), (1, 0)]
+
+
+def test_capacity_lets_one_employee_take_several_tasks(backend):
+    scores = np.array([[2, 1],
+                       [2, 1],
+                       [2, 1]])
+    pairs = solve_max_weight_assignment(scores, [2, 1])
+    assert check_plan(pairs, scores, np.array([2, 1])) == 5
+
+
+def test_assign_tasks_uses_profile_capacities_and_exclusions(backend):
+    matrix = SkillMatrix()
+    matrix.load([(10, 1, ["python", "sql"]), (20, 2, ["python"]), (30, 3, ["go"])])
+    tasks = [["python", "sql"], ["python"], ["sql"], ["rust"]]
+
+    plan = assign_tasks(matrix, tasks, capacities={10: 2})
+    assert plan[3] is None
+    assert sorted(p[0] for p in plan if p) == [10, 10, 20]
+    assert sum(p[1] for p in plan if p) == 4
+
+    plan = assign_tasks(matrix, tasks, exclude={10})
+    assert [p[0] for p in plan if p] == [20]
+
+    with pytest.raises(AssignmentTooLarge):
+        assign_tasks(matrix, tasks, capacities=5, max_cells=4)
@@ -0,0 +1,56 @@
+"""
+Tests for the manager dashboard statistics endpoint
+"""
+
+import asyncio
+import os
+import tempfile
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, AsyncSession_local
+from models import User, Task
+from dependencies.roles import require_manager
+from routes import dashboard
+
+
+def test_task_buckets_add_up_with_missing_and_legacy_statuses(monkeypatch):
+    app = FastAPI()
+    app.include_router(dashboard.router)
+    app.dependency_overrides[require_manager] = lambda: None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "test.db")
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine)() as db:
+            db.add(User(username="emp", email="emp@test.com", role="employee", availability=True))
+            db.add_all([
+                Task(title="pending", status="pending"),
+                Task(title="done", status="completed"),
+                Task(title="no status", status=None),   # POST /tasks/auto-assign without a status
+                Task(title="legacy casing", status="Pending"),
+            ])
+            db.commit()
+        engine.dispose()
+
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        monkeypatch.setattr(AsyncSession_local, "kw", {**AsyncSession_local.kw, "bind": async_engine})
+        try:
+            with TestClient(app) as client:
+                response = client.get("/dashboard/stats")
+        finally:
+            asyncio.run(async_engine.dispose())
+
+    assert response.status_code == 200
+    body = response.json()
+    task_stats = body["task_stats"]
+    assert task_stats == {"total_tasks": 4, "pending_tasks": 1, "in_progress_tasks": 0,
+                          "completed_tasks": 1, "cancelled_tasks": 0, "other_tasks": 2}
+    assert sum(v for k, v in task_stats.items() if k != "total_tasks") == task_stats["total_tasks"]
+    assert {t["title"]: t["status"] for t in body["recent_tasks"]}["no status"] is None
+    assert body["user_stats"]["active_users"] == 1
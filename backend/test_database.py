@@ -0,0 +1,71 @@
+"""
+Tests for the SQLite tuning profiles applied to every new connection
+"""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from database import SQLITE_PROFILES, apply_sqlite_profile
+
+PRODUCTION = SQLITE_PROFILES["production"]
+
+
+def read_pragmas(connection):
+    return {
+        name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+        for name in ("journal_mode", "synchronous", "busy_timeout", "mmap_size", "cache_size", "temp_store")
+    }
+
+
+def expected_pragmas():
+    # PRAGMA reads report enums as numbers: synchronous NORMAL = 1, temp_store MEMORY = 2
+    return {"journal_mode": "wal", "synchronous": 1, "busy_timeout": PRODUCTION["busy_timeout"],
+            "mmap_size": PRODUCTION["mmap_size"], "cache_size": PRODUCTION["cache_size"], "temp_store": 2}
+
+
+def test_production_profile_applies_to_every_pooled_connection():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'test.db')}")
+        apply_sqlite_profile(engine, "production")
+        try:
+            with engine.connect() as first, engine.connect() as second:
+                assert read_pragmas(first) == expected_pragmas()
+                assert read_pragmas(second) == expected_pragmas()
+        finally:
+            engine.dispose()
+
+
+def test_production_profile_applies_to_the_async_engine():
+    async def run(path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        apply_sqlite_profile(engine.sync_engine, "production")
+        try:
+            async with engine.connect() as connection:
+                return await connection.run_sync(lambda sync_connection: read_pragmas(sync_connection))
+        finally:
+            await engine.dispose()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        assert asyncio.run(run(os.path.join(tmp, "test.db"))) == expected_pragmas()
+
+
+def test_default_profile_leaves_sqlite_defaults():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'test.db')}")
+        apply_sqlite_profile(engine, "default")
+        try:
+            with engine.connect() as connection:
+                assert connection.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+        finally:
+            engine.dispose()
+
+
+def test_unknown_profile_is_rejected():
+    engine = create_engine("sqlite://")
+    with pytest.raises(ValueError, match="Unknown DB_PROFILE"):
+        apply_sqlite_profile(engine, "fast")
@@ -0,0 +1,62 @@
+"""
+Tests for the request-scoped session provider and its per-request DB stats
+"""
+
+import asyncio
+import os
+import tempfile
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, AsyncSession_local
+from models import User, Task
+from auth import create_access_token
+from auth_utils import user_cache
+from db_instrumentation import DBStatsMiddleware, instrument_engine
+from routes import task_routes
+
+
+def test_request_uses_one_connection_and_reports_db_stats(monkeypatch):
+    app = FastAPI()
+    app.add_middleware(DBStatsMiddleware)
+    app.include_router(task_routes.router)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "test.db")
+        sync_engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(sync_engine)
+        with sessionmaker(bind=sync_engine)() as db:
+            user = User(username="user0", email="user0@test.com", role="employee")
+            db.add(user)
+            db.flush()
+            db.add_all([Task(title=f"task {i}", status="pending", assignee_id=user.id) for i in range(5)])
+            db.commit()
+        sync_engine.dispose()
+
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        instrument_engine(engine.sync_engine)
+        checkouts = []
+        event.listen(engine.sync_engine, "checkout", lambda *args: checkouts.append(1))
+        monkeypatch.setattr(AsyncSession_local, "kw", {**AsyncSession_local.kw, "bind": engine})
+
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': 'user0@test.com'})}"}
+        user_cache.clear()
+        try:
+            with TestClient(app) as client:
+                first = client.get("/tasks/my", headers=headers)
+                assert first.status_code == 200
+                assert len(first.json()) == 5
+                # One connection serves both the user lookup and the task query
+                assert len(checkouts) == 1
+                assert first.headers["X-DB-Query-Count"] == "2"
+                assert float(first.headers["X-DB-Time-Ms"]) > 0
+
+                second = client.get("/tasks/my", headers=headers)
+                assert second.headers["X-DB-Query-Count"] == "1"  # identity served from the user cache
+        finally:
+            user_cache.clear()
+            asyncio.run(engine.dispose())
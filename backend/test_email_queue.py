@@ -0,0 +1,202 @@
+"""
+Tests for the background email queue and SMTP pool against a local aiosmtpd server
+"""
+
+import functools
+import smtplib
+import socket
+import pytest
+
+from ai_agents.email_queue import EmailQueue, is_transient
+from ai_agents.notification_agent import SMTPPool, build_email, deliver_email, send_email
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("refused"):
+            return "550 No such user"
+        if address.startswith("busy"):
+            return "450 Mailbox busy"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    try:
+        yield handler, functools.partial(
+            deliver_email, host=controller.hostname, port=controller.port, use_tls=False
+        )
+    finally:
+        controller.stop()
+
+
+def test_enqueued_emails_are_delivered(smtp_server):
+    handler, deliver = smtp_server
+    email_queue = EmailQueue(deliver=deliver, workers=2)
+
+    for i in range(5):
+        assert email_queue.enqueue(f"user{i}@test.com", f"Task {i}", "Hello")
+    assert email_queue.join(timeout=10)
+    email_queue.stop()
+
+    assert sorted(m.rcpt_tos[0] for m in handler.messages) == [f"user{i}@test.com" for i in range(5)]
+    stats = email_queue.stats()
+    assert stats["sent"] == 5
+    assert stats["failed"] == 0
+    assert stats["queue_depth"] == 0
+
+
+def test_failed_sends_are_retried(smtp_server):
+    handler, deliver = smtp_server
+    attempts = []
+
+    def flaky_deliver(msg):
+        attempts.append(msg["To"])
+        if len(attempts) < 3:
+            raise ConnectionError("temporary failure")
+        deliver(msg)
+
+    email_queue = EmailQueue(deliver=flaky_deliver, workers=1, max_retries=5, backoff=0.01)
+    email_queue.enqueue("retry@test.com", "Retry", "Hello")
+    assert email_queue.join(timeout=10)
+    email_queue.stop()
+
+    assert len(attempts) == 3
+    assert len(handler.messages) == 1
+    stats = email_queue.stats()
+    assert stats["retried"] == 2
+    assert stats["sent"] == 1
+
+
+def test_gives_up_after_max_retries():
+    def broken_deliver(msg):
+        raise ConnectionError("smtp down")
+
+    email_queue = EmailQueue(deliver=broken_deliver, workers=1, max_retries=2, backoff=0.01)
+    email_queue.enqueue("nobody@test.com", "Lost", "Hello")
+    assert email_queue.join(timeout=10)
+    email_queue.stop()
+
+    stats = email_queue.stats()
+    assert stats["failed"] == 1
+    assert stats["retried"] == 2
+    assert stats["sent"] == 0
+
+
+def test_permanent_rejections_are_not_retried(smtp_server):
+    handler, deliver = smtp_server
+    attempts = []
+
+    def counting_deliver(msg):
+        attempts.append(msg["To"])
+        deliver(msg)
+
+    email_queue = EmailQueue(deliver=counting_deliver, workers=1, max_retries=2, backoff=0.01)
+    email_queue.enqueue("refused@test.com", "Rejected", "Hello")
+    email_queue.enqueue("busy@test.com", "Greylisted", "Hello")
+    assert email_queue.join(timeout=10)
+    email_queue.stop()
+
+    assert attempts.count("refused@test.com") == 1
+    assert attempts.count("busy@test.com") == 3
+    stats = email_queue.stats()
+    assert stats["failed"] == 2
+    assert stats["retried"] == 2
+
+
+@pytest.mark.parametrize("error, transient", [
+    (smtplib.SMTPDataError(554, b"Message rejected"), False),
+    (smtplib.SMTPDataError(451, b"Try again later"), True),
+    (smtplib.SMTPSenderRefused(553, b"Sender refused", "bot@test.com"), False),
+    (smtplib.SMTPRecipientsRefused({"a@test.com": (550, b"No"), "b@test.com": (450, b"Busy")}), False),
+    (smtplib.SMTPRecipientsRefused({"a@test.com": (421, b"Later")}), True),
+    (smtplib.SMTPServerDisconnected("gone"), True),
+    (TimeoutError("timed out"), True),
+    (ConnectionRefusedError(), True),
+    (ValueError("bad address"), False),
+])
+def test_only_transient_errors_are_retryable(error, transient):
+    assert is_transient(error) is transient
+
+
+def test_smtp_pool_reuses_and_rotates_connections(smtp_server):
+    handler, deliver = smtp_server
+    pool = SMTPPool(host=deliver.keywords["host"], port=deliver.keywords["port"], use_tls=False, max_messages=3)
+
+    with pool.session() as session:
+        for i in range(7):
+            session.send(build_email(f"user{i}@test.com", "Sweep", "Hello"))
+    assert pool.connections_opened == 3
+
+    # An idle connection dropped by the server is replaced transparently
+    with pool.session() as session:
+        session._connection["smtp"].close()
+        session.send(build_email("again@test.com", "Sweep", "Hello"))
+    pool.close()
+
+    assert pool.connections_opened == 4
+    assert len(handler.messages) == 8
+
+
+def test_refused_recipient_keeps_the_pooled_connection(smtp_server):
+    handler, deliver = smtp_server
+    pool = SMTPPool(host=deliver.keywords["host"], port=deliver.keywords["port"], use_tls=False)
+
+    with pool.session() as session:
+        with pytest.raises(smtplib.SMTPRecipientsRefused):
+            session.send(build_email("refused@test.com", "Sweep", "Hello"))
+        session.send(build_email("user@test.com", "Sweep", "Hello"))
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        pool.send(build_email("refused@test.com", "Queue", "Hello"))
+    pool.send(build_email("user@test.com", "Queue", "Hello"))
+    pool.close()
+
+    assert pool.connections_opened == 1
+    assert len(handler.messages) == 2
+
+
+
+def test_timed_out_connection_is_not_returned_to_the_pool(smtp_server):
+    handler, deliver = smtp_server
+    pool = SMTPPool(host=deliver.keywords["host"], port=deliver.keywords["port"], use_tls=False)
+
+    def time_out(msg):
+        raise TimeoutError("timed out")
+
+    with pool.session() as session:
+        session.send(build_email("user@test.com", "Sweep", "Hello"))
+        session._connection["smtp"].send_message = time_out
+        # send_email swallows the error, so the session has to drop the connection itself
+        assert send_email("late@test.com", "Sweep", "Hello", session=session) is False
+        assert session._connection is None
+        assert send_email("next@test.com", "Sweep", "Hello", session=session) is True
+    assert pool.connections_opened == 2
+
+    with pool.session() as session:
+        session._connection["smtp"].send_message = time_out
+        with pytest.raises(TimeoutError):
+            session.send(build_email("late@test.com", "Queue", "Hello"))
+    pool.send(build_email("user@test.com", "Queue", "Hello"))
+    pool.close()
+
+    assert pool.connections_opened == 3
+    assert [m.rcpt_tos[0] for m in handler.messages] == ["user@test.com", "next@test.com", "user@test.com"]
@@ -0,0 +1,136 @@
+"""
+Tests for the shared async LLM client against a local stub chat-completions server
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ai_agents.llm_client import LLMClient, LLMError
+
+
+class StubLLMServer:
+    """
+    Serves POST /chat/completions. `responses` is consumed in order; each
+    entry is (status, delay_seconds). When it runs out, requests succeed.
+    """
+
+    def __init__(self, responses=None, delay: float = 0):
+        self.responses = list(responses or [])
+        self.delay = delay
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub.lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    status, delay = stub.responses.pop(0) if stub.responses else (200, stub.delay)
+                time.sleep(delay)
+                with stub.lock:
+                    stub.in_flight -= 1
+
+                content = json.dumps({"model": body["model"], "total_tasks": 1})
+                payload = json.dumps({"choices": [{"message": {"content": content}}]}) if status == 200 else "{}"
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload.encode())
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(*args, **kwargs):
+        servers.append(StubLLMServer(*args, **kwargs))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def chat(client: LLMClient, calls: int = 1):
+    async def run():
+        try:
+            return await asyncio.gather(*(
+                client.chat([{"role": "user", "content": "hi"}], model="stub-model") for _ in range(calls)
+            ), return_exceptions=True)
+        finally:
+            await client.aclose()
+    return asyncio.run(run())
+
+
+def test_retries_rate_limits_and_server_errors(stub):
+    server = stub([(429, 0), (503, 0)])
+    client = LLMClient(base_url=server.url, backoff=0.01)
+
+    [content] = chat(client)
+
+    assert json.loads(content)["model"] == "stub-model"
+    assert server.requests == 3
+    assert client.stats()["retried"] == 2
+
+
+def test_gives_up_after_max_retries(stub):
+    server = stub([(500, 0)] * 5)
+    client = LLMClient(base_url=server.url, max_retries=2, backoff=0.01)
+
+    [error] = chat(client)
+
+    assert isinstance(error, LLMError)
+    assert server.requests == 3
+    assert client.stats()["failed"] == 1
+
+
+def test_client_errors_are_not_retried(stub):
+    server = stub([(401, 0)])
+    client = LLMClient(base_url=server.url, backoff=0.01)
+
+    [error] = chat(client)
+
+    assert isinstance(error, LLMError)
+    assert server.requests == 1
+
+
+def test_read_timeout_is_retried(stub):
+    server = stub([(200, 1.0)])
+    client = LLMClient(base_url=server.url, timeout=0.2, backoff=0.01)
+
+    [content] = chat(client)
+
+    assert json.loads(content)["total_tasks"] == 1
+    assert server.requests == 2
+
+
+def test_concurrency_is_capped(stub):
+    server = stub(delay=0.1)
+    client = LLMClient(base_url=server.url, max_concurrency=2)
+
+    results = chat(client, calls=6)
+
+    assert all(isinstance(r, str) for r in results)
+    assert server.max_in_flight == 2
@@ -0,0 +1,103 @@
+"""
+Tests for the notification scheduler: watermarks, resends after the resend
+window, and the cross-process sweep lease
+"""
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import User, Task
+from ai_agents import notification_agent
+from ai_agents.notification_scheduler import NotificationScheduler
+from ai_agents.scheduler_lease import DatabaseLease
+
+
+@pytest.fixture
+def session_factory():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'test.db')}")
+        Base.metadata.create_all(engine)
+        try:
+            yield sessionmaker(bind=engine)
+        finally:
+            engine.dispose()
+
+
+def test_watermark_only_advances_after_a_sweep_without_failed_sends():
+    reports = [{"tasks": 2, "emails": 1, "failed": 1}, {"tasks": 1, "emails": 1, "failed": 0}]
+    seen = []
+
+    def sweep(since, now):
+        seen.append(since)
+        return reports.pop(0)
+
+    scheduler = NotificationScheduler(sweep=sweep)
+    scheduler.run_once()
+    assert scheduler.watermark is None
+    scheduler.run_once()
+    assert seen == [None, None]
+    assert scheduler.watermark is not None
+
+
+def test_watermarked_sweeps_resend_after_the_resend_window(session_factory, monkeypatch):
+    sent = []
+    monkeypatch.setattr(notification_agent, "Session_local", session_factory)
+    monkeypatch.setattr(notification_agent, "send_email", lambda recipient, *args, **kwargs: sent.append(recipient) or True)
+
+    start = datetime.utcnow()
+    with session_factory() as db:
+        user = User(username="emp", email="emp@test.com", role="employee")
+        db.add(user)
+        db.flush()
+        db.add(Task(title="late", status="pending", assignee_id=user.id,
+                    due_date=start - timedelta(days=3), created_at=start - timedelta(days=4)))
+        db.commit()
+
+    for digest in (False, True):
+        sent.clear()
+        with session_factory() as db:
+            db.query(notification_agent.NotificationLog).delete()
+            db.commit()
+
+        window = timedelta(hours=24)
+        first = notification_agent.run_notifications(digest, window, since=None, now=start)["emails"]
+        assert first >= 1
+        # Within the resend window: the watermark excludes it and so does the ledger
+        later = start + timedelta(minutes=5)
+        assert notification_agent.run_notifications(digest, window, since=start, now=later)["emails"] == 0
+        # The boundary was crossed long before the watermark, but the last reminder is now older than the window
+        next_day = start + timedelta(hours=25)
+        report = notification_agent.run_notifications(digest, window, since=next_day - timedelta(minutes=5), now=next_day)
+        assert report["emails"] == first
+        assert len(sent) == 2 * first
+
+
+def test_lease_keeps_sweeps_from_overlapping_across_processes(session_factory):
+    other_process = NotificationScheduler(sweep=lambda since, now: pytest.fail("overlapping sweep"),
+                                          lease=DatabaseLease("notification_sweep", 60, session_factory))
+    skipped = []
+
+    def sweep(since, now):
+        skipped.append(other_process.run_once())
+        return {"tasks": 0, "emails": 0, "failed": 0}
+
+    scheduler = NotificationScheduler(sweep=sweep, lease=DatabaseLease("notification_sweep", 60, session_factory))
+    assert scheduler.run_once() is not None
+    assert skipped == [None]
+
+    # Released after the sweep, so the other process takes the next one
+    other_process._sweep = lambda since, now: {"tasks": 0, "emails": 0, "failed": 0}
+    assert other_process.run_once() is not None
+
+
+def test_expired_lease_can_be_taken_over(session_factory):
+    crashed = DatabaseLease("notification_sweep", -1, session_factory)
+    assert crashed.acquire()
+    assert DatabaseLease("notification_sweep", 60, session_factory).acquire()
+    assert not crashed.acquire()
@@ -0,0 +1,99 @@
+"""
+Tests for the notification sweeps: digest mode sends one email per employee,
+and the ledger keeps repeated sweeps from resending the same reminder
+"""
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import User, Task, NotificationLog
+from ai_agents import notification_agent
+
+NOW = datetime(2026, 3, 2, 12, 0)
+WINDOW = timedelta(hours=24)
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+    """Seed two employees' tasks and record every email the sweeps send; sends to `failing` fail."""
+    outbox = SimpleNamespace(sent=[], failing=set(), Session=None)
+
+    def send_email(recipient, subject, message, session=None):
+        if recipient in outbox.failing:
+            return False
+        outbox.sent.append((recipient, subject))
+        return True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'test.db')}")
+        Base.metadata.create_all(engine)
+        outbox.Session = sessionmaker(bind=engine)
+        with outbox.Session() as db:
+            alice = User(username="alice", email="alice@test.com", role="employee")
+            bob = User(username="bob", email="bob@test.com", role="employee")
+            db.add_all([alice, bob])
+            db.flush()
+            db.add_all([
+                Task(title="late 1", status="pending", assignee_id=alice.id, due_date=NOW - timedelta(days=1)),
+                Task(title="late 2", status="in_progress", assignee_id=alice.id, due_date=NOW - timedelta(hours=3)),
+                Task(title="soon", status="pending", assignee_id=alice.id, due_date=NOW + timedelta(hours=1)),
+                Task(title="bob soon", status="pending", assignee_id=bob.id, due_date=NOW + timedelta(minutes=30)),
+                Task(title="done", status="Completed", assignee_id=bob.id, due_date=NOW - timedelta(days=1)),
+                Task(title="later", status="pending", assignee_id=bob.id, due_date=NOW + timedelta(days=3)),
+                Task(title="unassigned", status="pending", due_date=NOW - timedelta(days=1)),
+            ])
+            db.commit()
+
+        monkeypatch.setattr(notification_agent, "Session_local", outbox.Session)
+        monkeypatch.setattr(notification_agent, "send_email", send_email)
+        try:
+            yield outbox
+        finally:
+            engine.dispose()
+
+
+def test_digest_sends_one_email_per_employee(outbox):
+    report = notification_agent.run_notifications(digest=True, window=WINDOW, now=NOW)
+
+    assert report["mode"] == "digest"
+    assert sorted(outbox.sent) == [
+        ("alice@test.com", "[Task Digest] 2 overdue, 1 due soon"),
+        ("bob@test.com", "[Task Digest] 0 overdue, 1 due soon"),
+    ]
+    assert (report["emails"], report["failed"]) == (2, 0)
+    # Four per-task reminders for the two assignees collapsed into two emails
+    assert report["emails_saved"] == 2
+
+
+@pytest.mark.parametrize("digest", [False, True])
+def test_ledger_keeps_repeated_sweeps_from_resending(outbox, digest):
+    first = notification_agent.run_notifications(digest=digest, window=WINDOW, now=NOW)
+    assert first["emails"] > 0
+    with outbox.Session() as db:
+        ledger = {(log.task_id, log.kind) for log in db.query(NotificationLog)}
+    assert {(1, "overdue"), (2, "overdue"), (3, "due_soon"), (4, "due_soon")} <= ledger
+
+    again = notification_agent.run_notifications(digest=digest, window=WINDOW, now=NOW + timedelta(minutes=10))
+    assert again["emails"] == 0
+    assert len(outbox.sent) == first["emails"]
+
+
+@pytest.mark.parametrize("digest", [False, True])
+def test_failed_sends_are_not_recorded_and_go_out_on_the_next_sweep(outbox, digest):
+    outbox.failing.add("bob@test.com")
+    first = notification_agent.run_notifications(digest=digest, window=WINDOW, now=NOW)
+    assert first["failed"] == 1
+    assert {recipient for recipient, _ in outbox.sent} == {"alice@test.com"}
+
+    outbox.failing.clear()
+    outbox.sent.clear()
+    again = notification_agent.run_notifications(digest=digest, window=WINDOW, now=NOW + timedelta(minutes=10))
+    assert (again["emails"], again["failed"]) == (1, 0)
+    assert [recipient for recipient, _ in outbox.sent] == ["bob@test.com"]
@@ -0,0 +1,70 @@
+"""
+Tests for the password hashing policy: per-scheme costs and rehash on login
+"""
+
+import asyncio
+import os
+import tempfile
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import utils
+from database import Base, AsyncSession_local
+from models import User
+from routes import auth_routes
+from utils import build_pwd_context, scheme_rounds
+
+
+def test_rounds_only_apply_to_the_scheme_they_were_configured_for():
+    assert scheme_rounds("bcrypt", {}) == (12, 12, 12)
+    assert scheme_rounds("bcrypt", {"PASSWORD_BCRYPT_ROUNDS": "13", "PASSWORD_BCRYPT_MIN_ROUNDS": "11"}) == (13, 11, 13)
+    assert scheme_rounds("pbkdf2_sha256", {"PASSWORD_BCRYPT_ROUNDS": "13"}) is None
+
+    # The bcrypt cost must never leak into another scheme's iteration count
+    context = build_pwd_context(["pbkdf2_sha256", "bcrypt"], {"pbkdf2_sha256": None, "bcrypt": (12, 12, 12)})
+    rounds = int(context.hash("secret").split("$")[2])
+    assert rounds == context.handler("pbkdf2_sha256").default_rounds > 1000
+
+
+def test_login_rehashes_an_out_of_date_hash(monkeypatch):
+    old_context = build_pwd_context(["bcrypt"], {"bcrypt": (4, 4, 4)})
+    monkeypatch.setattr(utils, "pwd_context", build_pwd_context(["bcrypt"], {"bcrypt": (5, 5, 5)}))
+
+    app = FastAPI()
+    app.include_router(auth_routes.router)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "test.db")
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        with Session() as db:
+            db.add(User(username="old", email="old@test.com", role="employee",
+                        hashed_password=old_context.hash("secret")))
+            db.commit()
+
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        monkeypatch.setattr(AsyncSession_local, "kw", {**AsyncSession_local.kw, "bind": async_engine})
+        try:
+            with TestClient(app) as client:
+                assert client.post("/login", json={"email": "old@test.com", "password": "wrong"}).status_code == 401
+                with Session() as db:
+                    assert db.query(User).one().hashed_password.startswith("$2b$04$")
+
+                assert client.post("/login", json={"email": "old@test.com", "password": "secret"}).status_code == 200
+                with Session() as db:
+                    new_hash = db.query(User).one().hashed_password
+                assert new_hash.startswith("$2b$05$")
+                assert utils.verify_password("secret", new_hash)
+
+                # Already current: logging in again leaves the hash alone
+                assert client.post("/login", json={"email": "old@test.com", "password": "secret"}).status_code == 200
+                with Session() as db:
+                    assert db.query(User).one().hashed_password == new_hash
+        finally:
+            asyncio.run(async_engine.dispose())
+            engine.dispose()
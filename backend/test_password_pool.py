@@ -0,0 +1,46 @@
+"""
+Tests for the bounded password hashing pool's slot accounting
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from utils import PasswordHashPool, PasswordPoolFull
+
+
+def test_cancelled_caller_keeps_the_slot_until_the_hash_finishes():
+    pool = PasswordHashPool(workers=1, queue_size=0)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_hash():
+        started.set()
+        release.wait(5)
+        return "hash"
+
+    async def run():
+        caller = asyncio.create_task(pool.run(slow_hash))
+        await asyncio.to_thread(started.wait, 5)
+
+        # The client went away, but bcrypt is still running on the only worker
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        assert pool.stats()["pending"] == 1
+        with pytest.raises(PasswordPoolFull):
+            await pool.run(slow_hash)
+
+        release.set()
+        for _ in range(100):
+            if pool.stats()["pending"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert await pool.run(lambda: "next") == "next"
+
+    try:
+        asyncio.run(run())
+    finally:
+        release.set()
+        pool.shutdown()
+    assert pool.stats()["pending"] == 0
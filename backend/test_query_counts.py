@@ -0,0 +1,130 @@
+"""
+Statement-count tests: listing, sweep and aggregate queries must issue the
+same number of statements however many rows they cover, i.e. no lazy SELECT
+per row when touching the assignee / profile user relationships.
+"""
+
+import asyncio
+import inspect
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import User, Task, EmployeeProfile
+from schemas import TaskOut
+from ai_agents import notification_agent
+from ai_agents.assignment_agent import get_available_employees_with_skills
+from ai_agents.summary_agent import fetch_summary_counts
+from routes.task_routes import get_all_tasks
+from routes.dashboard import get_dashboard_stats
+
+
+def make_engine(path):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def run_action(path, action):
+    """
+    Run `action(db)` and return the statements it issued. Coroutine actions
+    (async route handlers) get an AsyncSession on the same database file.
+    """
+    if not inspect.iscoroutinefunction(action):
+        engine = make_engine(path)
+        db = sessionmaker(bind=engine)()
+        try:
+            with count_statements(engine) as statements:
+                action(db)
+            return statements
+        finally:
+            db.close()
+            engine.dispose()
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                with count_statements(engine.sync_engine) as statements:
+                    await action(db)
+                return statements
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def seed(engine, rows: int):
+    db = sessionmaker(bind=engine)()
+    due = datetime.utcnow() - timedelta(hours=1)
+    for i in range(rows):
+        user = User(username=f"user{i}", email=f"user{i}@test.com", role="employee", skills=["python"])
+        db.add(user)
+        db.flush()
+        db.add(EmployeeProfile(user_id=user.id, skills=["python"]))
+        db.add(Task(title=f"task {i}", status="pending", assignee_id=user.id, due_date=due))
+    db.commit()
+    db.close()
+
+
+@contextmanager
+def count_statements(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def statements_for(rows, action):
+    """Run `action` against a fresh database of `rows` tasks and count its statements."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "test.db")
+        engine = make_engine(path)
+        seed(engine, rows)
+        engine.dispose()
+        return len(run_action(path, action))
+
+
+async def list_tasks(db):
+    return [TaskOut.model_validate(t) for t in await get_all_tasks(Response(), limit=100, db=db, current_user=None)]
+
+
+async def dashboard_stats(db):
+    return await get_dashboard_stats(db=db, current_user=None)
+
+
+@pytest.mark.parametrize("action", [
+    pytest.param(list_tasks, id="list_tasks"),
+    pytest.param(
+        lambda db: get_available_employees_with_skills(db),
+        id="available_employees"
+    ),
+    pytest.param(
+        lambda db: fetch_summary_counts(db, list(range(1, 41))),
+        id="team_summary_counts"
+    ),
+    pytest.param(dashboard_stats, id="dashboard_stats"),
+])
+def test_statement_count_is_independent_of_row_count(action):
+    assert statements_for(3, action) == statements_for(40, action)
+
+
+def test_sweep_statement_count_is_independent_of_row_count(monkeypatch):
+    monkeypatch.setattr(notification_agent, "send_email", lambda *args, **kwargs: True)
+
+    for sweep in (notification_agent.notify_overdue, notification_agent.notify_due_soon, notification_agent.notify_digest):
+        assert statements_for(3, sweep) == statements_for(40, sweep)
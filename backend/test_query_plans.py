@@ -0,0 +1,91 @@
+"""
+Query-plan tests: the hot task/profile queries must be served by their
+composite indexes instead of scanning the table (SQLite EXPLAIN QUERY PLAN).
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database import Base
+from models import Task
+from query_options import task_with_assignee
+from pagination import keyset_statement
+from ai_agents import notification_agent
+from ai_agents.skill_index import available_profile_rows
+from ai_agents.summary_agent import fetch_tasks_for_summary, fetch_summary_counts
+from routes.task_routes import filter_tasks
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def query_plans(db, action):
+    """Run `action(db)` and return the EXPLAIN QUERY PLAN details of every SELECT it issued."""
+    engine = db.get_bind()
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            executed.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        action(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    raw = engine.raw_connection()
+    try:
+        return [
+            " | ".join(row[3] for row in raw.cursor().execute(f"EXPLAIN QUERY PLAN {statement}", parameters))
+            for statement, parameters in executed
+        ]
+    finally:
+        raw.close()
+
+
+def assert_uses_index(plans, *indexes):
+    assert plans
+    for plan in plans:
+        assert "SCAN tasks" not in plan and "SCAN employee_profiles" not in plan, plan
+        for index in indexes:
+            assert index in plan, plan
+
+
+def test_my_tasks_uses_assignee_index(db):
+    query = keyset_statement(filter_tasks(select(Task).options(task_with_assignee()), assignee_id=1), Task)
+    assert_uses_index(query_plans(db, lambda db: db.execute(query).all()), "ix_tasks_assignee_id_created_at_id")
+
+
+def test_summary_uses_one_index_per_or_branch(db):
+    plans = query_plans(db, lambda db: fetch_tasks_for_summary(db, 1))
+    assert_uses_index(plans, "MULTI-INDEX OR", "ix_tasks_assignee_id_created_at_id",
+                      "ix_tasks_assignee_id_status_updated_at")
+
+
+def test_summary_counts_use_assignee_indexes(db):
+    # IN (...) over several employees: one assignee-index search per employee, then the date filter
+    plans = query_plans(db, lambda db: fetch_summary_counts(db, [1, 2, 3]))
+    assert_uses_index(plans, "USING INDEX ix_tasks_assignee_id_", "(assignee_id=?")
+
+
+@pytest.mark.parametrize("sweep", [notification_agent.notify_due_soon, notification_agent.notify_overdue])
+@pytest.mark.parametrize("since", [None, datetime.utcnow() - timedelta(minutes=5)])
+def test_notification_sweeps_use_due_date_index(db, sweep, since):
+    plans = query_plans(db, lambda db: sweep(db, since=since))
+    assert_uses_index([p for p in plans if "tasks" in p], "ix_tasks_due_date_status")
+
+
+def test_available_profiles_use_availability_index(db):
+    assert_uses_index(query_plans(db, available_profile_rows), "ix_employee_profiles_is_available")
@@ -0,0 +1,138 @@
+"""
+Tests for the in-process skill index and skill matrix: incremental updates
+and rebuilds after outside changes keep their rankings equal to a scan of the
+available profiles in the database
+"""
+
+import os
+import random
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import User, EmployeeProfile
+from ai_agents.skill_index import SkillIndex, available_profile_rows
+from ai_agents.skill_matrix import SkillMatrix
+
+VOCABULARY = ["python", "sql", "go", "react", "docker", "rust"]
+QUERIES = [["python"], ["sql", "go"], ["react", "docker", "rust"], VOCABULARY, ["cobol"]]
+
+
+@pytest.fixture
+def db():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'test.db')}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        rng = random.Random(3)
+        for i in range(20):
+            add_profile(session, f"emp{i}", rng.sample(VOCABULARY, rng.randint(1, 3)))
+        session.commit()
+        try:
+            yield session
+        finally:
+            session.close()
+            engine.dispose()
+
+
+def add_profile(db, username, skills, available=True):
+    user = User(username=username, email=f"{username}@test.com", role="employee")
+    db.add(user)
+    db.flush()
+    profile = EmployeeProfile(user_id=user.id, skills=skills, is_available=available)
+    db.add(profile)
+    db.flush()
+    return profile
+
+
+def db_scan_rank(db, required):
+    """The original matcher: score every available profile read from the database."""
+    ranked = []
+    for profile_id, _, skills in available_profile_rows(db):
+        score = len(set(skills) & set(required))
+        if score:
+            ranked.append((profile_id, score, score / len(required) * 100))
+    return sorted(ranked, key=lambda r: (-r[1], r[0]))
+
+
+def index_rank(index, required):
+    ranked = [(pid, len(skills), len(skills) / len(required) * 100) for pid, skills in index.candidates(required).items()]
+    return sorted(ranked, key=lambda r: (-r[1], r[0]))
+
+
+def assert_matches_db(db, index, matrix):
+    for required in QUERIES:
+        expected = db_scan_rank(db, required)
+        assert index_rank(index, required) == expected, required
+        assert matrix.rank(required) == expected, required
+
+
+def test_incremental_updates_match_a_db_scan_without_rebuilding(db):
+    index, matrix = SkillIndex(), SkillMatrix(initial_capacity=4)
+    index.ensure_built(db)
+    matrix.ensure_built(db)
+    built_at = (index._built_at, matrix._built_at)
+
+    rng = random.Random(5)
+    profiles = db.query(EmployeeProfile).all()
+    for step in range(30):
+        profile = rng.choice(profiles)
+        if profile.is_available and rng.random() < 0.5:
+            profile.is_available = False
+        else:
+            profile.is_available = True
+            profile.skills = rng.sample(VOCABULARY, rng.randint(1, 4))
+        if step % 5 == 0:
+            profiles.append(add_profile(db, f"new{step}", rng.sample(VOCABULARY, 2)))
+        db.commit()
+        # What index_employee_profile / unindex_employee_profile do after each commit
+        for p in profiles:
+            if p.is_available:
+                index.add(p.id, p.user_id, p.skills)
+                matrix.add(p.id, p.user_id, p.skills)
+            else:
+                index.remove(p.id)
+                matrix.remove(p.id)
+
+        index.ensure_built(db)
+        matrix.ensure_built(db)
+        assert_matches_db(db, index, matrix)
+
+    assert (index._built_at, matrix._built_at) == built_at
+
+
+def test_changes_made_outside_this_process_are_picked_up(db):
+    index, matrix = SkillIndex(), SkillMatrix()
+    index.ensure_built(db)
+    matrix.ensure_built(db)
+
+    # Another worker (or a script) registers one employee and assigns another
+    add_profile(db, "elsewhere", ["python", "rust"])
+    db.query(EmployeeProfile).filter(EmployeeProfile.id == 1).update({"is_available": False})
+    db.commit()
+
+    index.ensure_built(db)
+    matrix.ensure_built(db)
+    assert_matches_db(db, index, matrix)
+
+
+def test_skill_edits_made_elsewhere_are_picked_up_after_max_age(db):
+    index, matrix = SkillIndex(max_age=60), SkillMatrix(max_age=60)
+    index.ensure_built(db)
+    matrix.ensure_built(db)
+
+    # Same available profiles, so only the age check can notice
+    db.query(EmployeeProfile).filter(EmployeeProfile.id == 2).update({"skills": ["cobol"]})
+    db.commit()
+    index.ensure_built(db)
+    assert 2 not in index.candidates(["cobol"])
+
+    index._built_at -= 61
+    matrix._built_at -= 61
+    index.ensure_built(db)
+    matrix.ensure_built(db)
+    assert_matches_db(db, index, matrix)
+    assert [r[0] for r in matrix.rank(["cobol"])] == [2]
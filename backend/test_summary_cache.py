@@ -0,0 +1,84 @@
+"""
+Tests for the content-addressed summary cache (memory and SQLite tiers)
+"""
+
+from datetime import datetime, timedelta
+
+from ai_agents.summary_cache import SummaryCache, summary_cache_key
+
+COUNTS = {"total_tasks": 1, "overdue": 0, "upcoming": 1, "stagnant": 0, "by_status": {"pending": 1, "completed": 0}}
+
+
+def test_key_changes_with_counts_model_and_prompt_version():
+    key = summary_cache_key(COUNTS, "alice", "model-a", "1")
+    assert key == summary_cache_key(dict(reversed(list(COUNTS.items()))), "alice", "model-a", "1")
+
+    changed = {**COUNTS, "by_status": {"pending": 0, "completed": 1}}
+    assert summary_cache_key(changed, "alice", "model-a", "1") != key
+    assert summary_cache_key(COUNTS, "alice", "model-b", "1") != key
+    assert summary_cache_key(COUNTS, "alice", "model-a", "2") != key
+
+
+def test_memory_tier_hits_and_misses():
+    cache = SummaryCache(path="")
+    key = summary_cache_key(COUNTS, "alice", "model-a", "1")
+
+    assert cache.get(key) is None
+    cache.set(key, {"employee": "alice", "total_tasks": 1})
+    assert cache.get(key) == {"employee": "alice", "total_tasks": 1}
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["memory_hits"], stats["misses"], stats["stores"]) == (1, 1, 1, 1)
+    assert not stats["persistent"]
+
+
+def test_sqlite_tier_survives_a_new_instance(tmp_path):
+    path = str(tmp_path / "summary_cache.db")
+    key = summary_cache_key(COUNTS, "alice", "model-a", "1")
+
+    first = SummaryCache(path=path)
+    first.set(key, {"employee": "alice", "total_tasks": 1})
+    first.close()
+
+    second = SummaryCache(path=path)
+    assert second.get(key) == {"employee": "alice", "total_tasks": 1}
+    assert second.get(key) == {"employee": "alice", "total_tasks": 1}
+    second.close()
+
+    stats = second.stats()
+    assert (stats["disk_hits"], stats["memory_hits"]) == (1, 1)
+
+
+def test_sqlite_tier_applies_the_ttl(tmp_path):
+    path = str(tmp_path / "summary_cache.db")
+    key = summary_cache_key(COUNTS, "alice", "model-a", "1")
+    stale = summary_cache_key(COUNTS, "bob", "model-a", "1")
+
+    first = SummaryCache(ttl=60, path=path)
+    first.set(stale, {"employee": "bob"})
+    old = (datetime.utcnow() - timedelta(seconds=61)).isoformat()
+    first._connection().execute("UPDATE summary_cache SET created_at = ? WHERE key = ?", (old, stale))
+    first._connection().commit()
+    first.close()
+
+    second = SummaryCache(ttl=60, path=path)
+    assert second.get(stale) is None
+    # The next store also deletes the expired row
+    second.set(key, {"employee": "alice"})
+    assert [row[0] for row in second._connection().execute("SELECT key FROM summary_cache")] == [key]
+    second.close()
+
+
+def test_sqlite_tier_keeps_at_most_maxsize_newest_entries(tmp_path):
+    path = str(tmp_path / "summary_cache.db")
+    keys = [summary_cache_key(COUNTS, f"emp{i}", "model-a", "1") for i in range(5)]
+
+    cache = SummaryCache(maxsize=3, path=path)
+    for i, key in enumerate(keys):
+        cache.set(key, {"employee": f"emp{i}"})
+    assert cache._connection().execute("SELECT COUNT(*) FROM summary_cache").fetchone()[0] == 3
+    cache.close()
+
+    fresh = SummaryCache(maxsize=3, path=path)
+    assert [fresh.get(key) is not None for key in keys] == [False, False, True, True, True]
+    fresh.close()
@@ -0,0 +1,47 @@
+"""
+Tests for the SQL-side summary aggregation: fetch_summary_counts agrees with
+the per-employee task lists the summary used to be built from
+"""
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import User, Task
+from ai_agents.summary_agent import fetch_tasks_for_summary, fetch_summary_counts
+
+
+def test_summary_counts_match_per_employee_summary_data():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'test.db')}")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        now = datetime.utcnow()
+        for i in range(3):
+            user = User(username=f"user{i}", email=f"user{i}@test.com", role="employee")
+            db.add(user)
+            db.flush()
+            db.add(Task(title=f"task {i}", status="pending", assignee_id=user.id, due_date=now - timedelta(hours=1)))
+        db.add_all([
+            Task(title="upcoming", status="in_progress", assignee_id=1, due_date=now + timedelta(days=1)),
+            Task(title="stagnant", status="pending", assignee_id=1, status_updated_at=now - timedelta(days=3)),
+            Task(title="done", status="completed", assignee_id=2, due_date=now + timedelta(days=5)),
+            Task(title="legacy casing", status="Pending", assignee_id=3, status_updated_at=now - timedelta(days=3)),
+        ])
+        db.commit()
+        try:
+            counts = fetch_summary_counts(db, [1, 2, 3, 99])
+            for user_id in (1, 2, 3, 99):
+                data = fetch_tasks_for_summary(db, user_id)
+                assert counts[user_id]["total_tasks"] == len(data["all_tasks"])
+                for key in ("overdue", "upcoming", "stagnant"):
+                    assert counts[user_id][key] == len(data[key]), (user_id, key)
+            assert counts[1]["by_status"] == {"pending": 2, "in_progress": 1, "completed": 0, "cancelled": 0}
+            assert counts[99]["total_tasks"] == 0
+        finally:
+            db.close()
+            engine.dispose()
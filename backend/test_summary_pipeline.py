@@ -0,0 +1,160 @@
+"""
+Tests for the pre-computed summary pipeline: only employees whose tasks
+changed are sent to the LLM, and the routes' lookup finds the stored rows.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import User, Task
+from ai_agents import summary_pipeline
+from ai_agents.summary_agent import fetch_summary_counts, LLM_MODEL, PROMPT_VERSION
+from ai_agents.summary_cache import summary_cache_key
+from ai_agents.llm_client import LLMError
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    for i in range(3):
+        user = User(username=f"emp{i}", email=f"emp{i}@test.com", role="employee")
+        db.add(user)
+        db.flush()
+        db.add(Task(title=f"task {i}", status="pending", assignee_id=user.id))
+    db.add(User(username="boss", email="boss@test.com", role="manager"))
+    db.commit()
+    db.close()
+    engine.dispose()
+    return path
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+
+    async def fake_call_llm(prompt):
+        calls.append(prompt)
+        if "Employee: emp_broken" in prompt:
+            raise LLMError("provider down")
+        return {"total_tasks": prompt.count("Total Tasks: 1")}
+
+    monkeypatch.setattr(summary_pipeline, "call_llm", fake_call_llm)
+    return calls
+
+
+def run_pipeline(db_path, **kwargs):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        try:
+            return await summary_pipeline.run_summary_pipeline(
+                session_factory=async_sessionmaker(engine, expire_on_commit=False), **kwargs
+            )
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def load_materialized(db_path, user_id):
+    engine = create_engine(f"sqlite:///{db_path}")
+    db = sessionmaker(bind=engine)()
+    content_hash = summary_cache_key(fetch_summary_counts(db, [user_id])[user_id], f"emp{user_id - 1}", LLM_MODEL, PROMPT_VERSION)
+    db.close()
+    engine.dispose()
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        try:
+            async with async_sessionmaker(engine)() as db:
+                return await summary_pipeline.load_daily_summaries(db, {user_id: content_hash})
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def touch_task(db_path, task_id):
+    engine = create_engine(f"sqlite:///{db_path}")
+    db = sessionmaker(bind=engine)()
+    task = db.get(Task, task_id)
+    task.status = "completed"
+    task.status_updated_at = datetime.utcnow()
+    db.commit()
+    db.close()
+    engine.dispose()
+
+
+def test_only_changed_employees_are_regenerated(db_path, llm_calls):
+    report = run_pipeline(db_path)
+    assert (report["employees"], report["generated"], report["unchanged"], report["failed"]) == (3, 3, 0, 0)
+    assert len(llm_calls) == 3
+    assert load_materialized(db_path, 1) == {1: {"total_tasks": 1}}
+
+    report = run_pipeline(db_path)
+    assert (report["generated"], report["unchanged"]) == (0, 3)
+    assert len(llm_calls) == 3
+
+    touch_task(db_path, 2)
+    assert load_materialized(db_path, 2) == {}
+    report = run_pipeline(db_path)
+    assert (report["generated"], report["unchanged"]) == (1, 2)
+    assert load_materialized(db_path, 2) == {2: {"total_tasks": 1}}
+
+    report = run_pipeline(db_path, employee_ids=[1], force=True)
+    assert (report["employees"], report["generated"], report["unchanged"]) == (1, 1, 0)
+
+
+def test_failed_summaries_are_reported_and_not_stored(db_path, llm_calls):
+    engine = create_engine(f"sqlite:///{db_path}")
+    db = sessionmaker(bind=engine)()
+    db.get(User, 3).username = "emp_broken"
+    db.commit()
+    db.close()
+    engine.dispose()
+
+    report = run_pipeline(db_path)
+    assert (report["generated"], report["failed"]) == (2, 1)
+
+    # The failed employee is retried on the next run; the others are not
+    report = run_pipeline(db_path)
+    assert (report["generated"], report["unchanged"], report["failed"]) == (0, 2, 1)
+
+
+def test_concurrent_runs_upsert_the_same_rows(db_path, llm_calls, monkeypatch):
+    fake_call_llm = summary_pipeline.call_llm
+
+    async def slow_call_llm(prompt):
+        # Both runs read the (empty) daily_summaries table before either writes
+        await asyncio.sleep(0.05)
+        return await fake_call_llm(prompt)
+
+    monkeypatch.setattr(summary_pipeline, "call_llm", slow_call_llm)
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        try:
+            factory = async_sessionmaker(engine, expire_on_commit=False)
+            return await asyncio.gather(*(
+                summary_pipeline.run_summary_pipeline(session_factory=factory) for _ in range(2)
+            ))
+        finally:
+            await engine.dispose()
+
+    reports = asyncio.run(run())
+    assert [(r["generated"], r["failed"]) for r in reports] == [(3, 0), (3, 0)]
+    assert len(llm_calls) == 6
+    assert load_materialized(db_path, 1) == {1: {"total_tasks": 1}}
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT COUNT(*) FROM daily_summaries").scalar() == 3
+    engine.dispose()
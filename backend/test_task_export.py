@@ -0,0 +1,97 @@
+"""
+Tests for the streamed NDJSON / CSV task export
+"""
+
+import asyncio
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, AsyncSession_local, register_sqlite_functions
+from models import User, Task
+from dependencies.roles import require_manager
+from routes import task_routes
+
+TASKS = 7
+
+
+@pytest.fixture
+def client(monkeypatch):
+    app = FastAPI()
+    app.include_router(task_routes.router)
+    app.dependency_overrides[require_manager] = lambda: None
+    # Several batches per export
+    monkeypatch.setattr(task_routes, "EXPORT_BATCH_SIZE", 3)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "test.db")
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine)() as db:
+            user = User(username="emp", email="emp@test.com", role="employee")
+            db.add(user)
+            db.flush()
+            for i in range(TASKS):
+                db.add(Task(title=f"task {i}", description="line one, \"quoted\"\nline two",
+                            status="completed" if i % 2 else "pending",
+                            assignee_id=user.id if i < TASKS - 1 else None,
+                            created_at=datetime(2026, 1, 1, i), required_skills=["python", "sql"] if i % 3 == 0 else []))
+            db.commit()
+        engine.dispose()
+
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        register_sqlite_functions(async_engine.sync_engine)
+        monkeypatch.setattr(AsyncSession_local, "kw", {**AsyncSession_local.kw, "bind": async_engine})
+        try:
+            with TestClient(app) as test_client:
+                yield test_client
+        finally:
+            asyncio.run(async_engine.dispose())
+
+
+def test_ndjson_export_streams_every_task_with_its_assignee(client):
+    response = client.get("/tasks/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["content-disposition"] == 'attachment; filename="tasks.ndjson"'
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == list(range(1, TASKS + 1))
+    assert list(rows[0]) == task_routes.EXPORT_FIELDS
+    assert rows[0]["assignee_username"] == "emp"
+    assert rows[0]["required_skills"] == ["python", "sql"]
+    assert rows[0]["created_at"] == "2026-01-01T00:00:00"
+    assert rows[-1]["assignee_id"] is None and rows[-1]["assignee_email"] is None
+
+
+def test_csv_export_quotes_fields_and_joins_skills(client):
+    response = client.get("/tasks/export", params={"format": "csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == TASKS
+    assert rows[0]["description"] == "line one, \"quoted\"\nline two"
+    assert rows[0]["required_skills"] == "python;sql"
+    assert rows[1]["required_skills"] == ""
+
+
+def exported_ids(response):
+    return [json.loads(line)["id"] for line in response.text.splitlines()]
+
+
+def test_export_applies_the_listing_filters(client):
+    assert exported_ids(client.get("/tasks/export", params={"status": "completed"})) == [2, 4, 6]
+    assert exported_ids(client.get("/tasks/export", params={"skill": "SQL"})) == [1, 4, 7]
+    assert client.get("/tasks/export", params={"status": "missing"}).text == ""
+    assert client.get("/tasks/export", params={"format": "xml"}).status_code == 422
@@ -0,0 +1,104 @@
+"""
+Tests for the task listing filters and keyset pagination of GET /tasks/
+"""
+
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, AsyncSession_local, register_sqlite_functions
+from models import User, Task
+from dependencies.roles import require_manager
+from routes import task_routes
+
+TASKS = 23
+
+
+@pytest.fixture
+def client(monkeypatch):
+    app = FastAPI()
+    app.include_router(task_routes.router)
+    app.dependency_overrides[require_manager] = lambda: None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "test.db")
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine)() as db:
+            user = User(username="emp", email="emp@test.com", role="employee")
+            db.add(user)
+            db.flush()
+            # Several tasks share a created_at, so the id tie-break matters
+            base = datetime(2026, 1, 1)
+            for i in range(TASKS):
+                db.add(Task(title=f"task {i}", status="pending", assignee_id=user.id,
+                            created_at=base + timedelta(minutes=i // 3),
+                            required_skills=["Python", "Élixir"] if i % 4 == 0 else ["Go"]))
+            db.commit()
+        engine.dispose()
+
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        register_sqlite_functions(async_engine.sync_engine)
+        monkeypatch.setattr(AsyncSession_local, "kw", {**AsyncSession_local.kw, "bind": async_engine})
+        try:
+            with TestClient(app) as test_client:
+                yield test_client
+        finally:
+            asyncio.run(async_engine.dispose())
+
+
+def all_pages(client, limit, **params):
+    pages, cursor = [], None
+    while True:
+        response = client.get("/tasks/", params={"limit": limit, **params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        pages.append([task["id"] for task in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+
+
+def test_skill_filter_is_case_insensitive_and_keeps_stored_casing(client):
+    expected = {i + 1 for i in range(TASKS) if i % 4 == 0}
+    for skill in ("python", "PYTHON", " Python ", "élixir", "ÉLIXIR"):
+        response = client.get("/tasks/", params={"skill": skill})
+        assert {task["id"] for task in response.json()} == expected, skill
+    assert response.json()[0]["required_skills"] == ["Python", "Élixir"]
+    assert client.get("/tasks/", params={"skill": "pyth"}).json() == []
+
+
+def test_cursor_round_trip_returns_every_task_once_newest_first(client):
+    pages = all_pages(client, limit=5)
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+    ids = [task_id for page in pages for task_id in page]
+    # Newest first by (created_at, id): groups of three share a created_at
+    assert ids == sorted(range(1, TASKS + 1), key=lambda i: ((i - 1) // 3, i), reverse=True)
+
+    # Filters apply to every page, not just the first
+    assert [i for page in all_pages(client, limit=2, skill="PYTHON") for i in page] == [21, 17, 13, 9, 5, 1]
+
+
+def test_deep_page_continues_after_its_cursor(client):
+    pages = all_pages(client, limit=1)
+    assert len(pages) == TASKS
+    cursor = None
+    for _ in range(TASKS - 2):
+        cursor = client.get("/tasks/", params={"limit": 1, **({"cursor": cursor} if cursor else {})}).headers["X-Next-Cursor"]
+    deep = client.get("/tasks/", params={"limit": 5, "cursor": cursor})
+    assert [task["id"] for task in deep.json()] == pages[-2] + pages[-1]
+    assert "X-Next-Cursor" not in deep.headers
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "W10", "WyJ4IiwgMV0"])
+def test_invalid_cursor_is_rejected(client, cursor):
+    response = client.get("/tasks/", params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,78 @@
+"""
+Tests for the authenticated-user cache behind get_current_user
+"""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import User
+from auth import create_access_token
+from auth_utils import get_current_user, user_cache
+
+CREDENTIALS = HTTPAuthorizationCredentials(
+    scheme="Bearer", credentials=create_access_token({"sub": "user0@test.com", "role": "employee"})
+)
+
+
+@pytest.fixture
+def db_path():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "test.db")
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine)() as db:
+            db.add(User(username="user0", email="user0@test.com", role="employee"))
+            db.commit()
+        engine.dispose()
+        user_cache.clear()
+        try:
+            yield path
+        finally:
+            user_cache.clear()
+
+
+def run_with_session(path, action):
+    """Run `action(db)` on an AsyncSession and return the statements it issued."""
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                await action(db)
+            return statements
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def test_current_user_is_served_from_cache(db_path):
+    async def resolve_twice(db):
+        first = await get_current_user(CREDENTIALS, db)
+        second = await get_current_user(CREDENTIALS, db)
+        assert first == second and first.role == "employee"
+
+    assert len(run_with_session(db_path, resolve_twice)) == 1
+
+
+def test_cached_user_is_evicted_again_after_the_commit(db_path):
+    async def promote_and_resolve(db):
+        user = await db.scalar(select(User).where(User.email == "user0@test.com"))
+        user.role = "manager"
+        await db.flush()
+        # A concurrent request still reads the committed row and caches it again before the commit
+        async with async_sessionmaker(db.bind)() as other:
+            assert (await get_current_user(CREDENTIALS, other)).role == "employee"
+        await db.commit()
+        assert (await get_current_user(CREDENTIALS, db)).role == "manager"
+
+    run_with_session(db_path, promote_and_resolve)
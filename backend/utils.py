@@ -1,11 +1,172 @@
 # utils.py
 
+import os
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", 32))
+
+# Hashing policy: new hashes use the first scheme; the others are only verified (and then rehashed)
+PASSWORD_SCHEMES = [s.strip() for s in os.getenv("PASSWORD_SCHEMES", "bcrypt").split(",") if s.strip()]
+# Default cost per scheme; a scheme's cost is only overridden where configured
+# as PASSWORD_<SCHEME>_ROUNDS (e.g. PASSWORD_BCRYPT_ROUNDS, bcrypt: log2 rounds;
+# PASSWORD_PBKDF2_SHA256_ROUNDS: iterations). Other schemes keep passlib's defaults.
+DEFAULT_SCHEME_ROUNDS = {"bcrypt": 12}
+
+
+def scheme_rounds(scheme: str, environ=os.environ):
+    """
+    `(default, min, max)` cost configured for `scheme`, or None to use passlib's
+    defaults. Hashes outside [min, max] are rehashed on login.
+    """
+    prefix = f"PASSWORD_{scheme.upper()}_"
+    rounds = environ.get(prefix + "ROUNDS", DEFAULT_SCHEME_ROUNDS.get(scheme))
+    if rounds is None:
+        return None
+    rounds = int(rounds)
+    min_rounds = int(environ.get(prefix + "MIN_ROUNDS", rounds))
+    max_rounds = int(environ.get(prefix + "MAX_ROUNDS", rounds))
+    return rounds, min(min_rounds, rounds), max(max_rounds, rounds)
+
+
+def build_pwd_context(schemes: list = None, rounds: dict = None):
+    """
+    CryptContext for a hashing policy. `rounds` maps a scheme to its
+    `(default, min, max)` cost; defaults come from the PASSWORD_* settings.
+    """
+    schemes = schemes or PASSWORD_SCHEMES
+    if rounds is None:
+        rounds = {scheme: scheme_rounds(scheme) for scheme in schemes}
+    settings = {}
+    for scheme, cost in rounds.items():
+        if cost is None:
+            continue
+        default_rounds, min_rounds, max_rounds = cost
+        settings[f"{scheme}__default_rounds"] = default_rounds
+        settings[f"{scheme}__min_rounds"] = min_rounds
+        settings[f"{scheme}__max_rounds"] = max_rounds
+    return CryptContext(schemes=schemes, deprecated="auto", **settings)
+
+
+pwd_context = build_pwd_context()
 
 def hash_password(password: str):
     return pwd_context.hash(password)
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password, hashed_password):
+    """
+    Returns `(valid, new_hash)`; `new_hash` is set when the stored hash no
+    longer matches the policy (deprecated scheme or cost out of range).
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordPoolFull(Exception):
+    pass
+
+
+class PasswordHashPool:
+    """
+    Dedicated, bounded thread pool for bcrypt work so hashing never runs on the
+    event loop or in the threadpool shared with other sync endpoints.
+
+    bcrypt releases the GIL while hashing, so worker threads hash in parallel.
+    At most `workers + queue_size` calls may be pending; beyond that `run`
+    raises PasswordPoolFull instead of queueing without bound.
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, queue_size: int = PASSWORD_HASH_QUEUE_SIZE):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {
+            "completed": 0,
+            "rejected": 0,
+            "hash_seconds_total": 0.0,
+            "hash_seconds_max": 0.0,
+            "queue_wait_seconds_total": 0.0,
+            "queue_wait_seconds_max": 0.0,
+        }
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    async def run(self, func, *args):
+        with self._lock:
+            if self._pending >= self.workers + self.queue_size:
+                self._stats["rejected"] += 1
+                raise PasswordPoolFull()
+            self._pending += 1
+
+        submitted = time.monotonic()
+
+        def job():
+            started = time.monotonic()
+            try:
+                return func(*args)
+            finally:
+                self._record(started - submitted, time.monotonic() - started)
+
+        try:
+            future = self._get_executor().submit(job)
+        except Exception:
+            self._release()
+            raise
+        # Free the slot when the job itself ends (or is cancelled before it starts), not when the
+        # caller stops waiting: a disconnected request's bcrypt call keeps its worker busy until done
+        future.add_done_callback(lambda _: self._release())
+        return await asyncio.wrap_future(future)
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+
+    def _record(self, queue_wait, elapsed):
+        with self._lock:
+            self._stats["completed"] += 1
+            self._stats["hash_seconds_total"] += elapsed
+            self._stats["hash_seconds_max"] = max(self._stats["hash_seconds_max"], elapsed)
+            self._stats["queue_wait_seconds_total"] += queue_wait
+            self._stats["queue_wait_seconds_max"] = max(self._stats["queue_wait_seconds_max"], queue_wait)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = self._pending
+        completed = stats["completed"]
+        stats["hash_seconds_avg"] = stats["hash_seconds_total"] / completed if completed else 0.0
+        stats["queue_wait_seconds_avg"] = stats["queue_wait_seconds_total"] / completed if completed else 0.0
+        stats["workers"] = self.workers
+        stats["queue_size"] = self.queue_size
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True)
+
+
+# Shared, process-wide pool
+password_pool = PasswordHashPool()
+
+async def hash_password_async(password: str):
+    return await password_pool.run(hash_password, password)
+
+async def verify_password_async(plain_password, hashed_password):
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+async def verify_and_update_password_async(plain_password, hashed_password):
+    return await password_pool.run(verify_and_update_password, plain_password, hashed_password)